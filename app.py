@@ -3,7 +3,10 @@ import streamlit as st
 from config.settings import APP_TITLE, APP_SUBTITLE
 from ui.sidebar import render as render_sidebar
 from core.cache import df_manager
-from core.data_loader import load_data
+from core.backend import get_backend, is_lazy
+from core.data_loader import load_data, append_data, file_digest
+from core.excel_reader import list_sheets
+from core.sources import list_tables, open_source
 from ui.style import style_css
 from pathlib import Path
 
@@ -35,16 +38,62 @@ uploaded_file = render_sidebar()
 if 'df' not in st.session_state:
     st.session_state.df = None
 
-if uploaded_file is not None:
+# Mode ajout : chaque nouveau fichier (même schéma) est ajouté au jeu de données courant
+append_mode = st.sidebar.toggle("➕ Mode ajout (cumuler les fichiers)", key="append_mode",
+                                help="Ajoute les lignes du fichier chargé au jeu de données courant au lieu de le remplacer")
+
+# Source locale interrogée sur place (base SQLite, fichier / dossier Parquet) : filtres et
+# agrégats exécutés par le moteur de la source, rien n'est chargé en mémoire
+with st.sidebar.expander("🗄️ Base SQLite / dossier Parquet"):
+    location = st.text_input("Chemin local", key="sql_location",
+                             help="Fichier .db / .sqlite, fichier .parquet ou dossier de fichiers Parquet")
+    if location:
+        try:
+            tables = list_tables(location)
+            table = st.selectbox("Table", tables, key="sql_table") if len(tables) > 1 else tables[0]
+            if st.button("Connecter", key="sql_connect", use_container_width=True):
+                st.session_state.df = open_source(location, table)
+                st.success(f"✅ {table} connecté ({len(st.session_state.df.columns)} colonnes, données non chargées)")
+        except Exception as e:
+            st.error(f"Source inaccessible : {e}")
+
+# Sélection des feuilles pour les classeurs Excel multi-feuilles
+sheets = None
+if uploaded_file is not None and uploaded_file.name.lower().endswith(('.xls', '.xlsx')):
+    available_sheets = list_sheets(uploaded_file)
+    if len(available_sheets) > 1:
+        sheets = st.sidebar.multiselect("Feuilles Excel", available_sheets, default=available_sheets[:1])
+        sheets = tuple(sheets) or None
+
+# Rechargement uniquement si la source change : le même objet DataFrame est conservé
+# entre les reruns, ce qui garde valides les caches indexés par version (core.cache.dataset_version).
+# L'empreinte du contenu distingue un fichier modifié renvoyé sous le même nom (mode ajout)
+source = (uploaded_file.name, file_digest(uploaded_file), sheets) if uploaded_file is not None else None
+if source is not None and (st.session_state.df is None or st.session_state.get("df_source") != source):
     with st.spinner("Chargement du fichier en cours..."):
         @st.cache_data(show_spinner=False)
-        def load_cached(_file):
-            return load_data(_file)
-
-        raw_df = load_cached(uploaded_file)
-        if raw_df is not None:
+        def load_cached(_file, file_name, digest, sheets):
+            return load_data(_file, sheets=sheets)
+
+        raw_df = load_cached(uploaded_file, uploaded_file.name, source[1], sheets)
+        current_df = st.session_state.df
+        if raw_df is not None and append_mode and current_df is not None \
+                and not is_lazy(current_df) and not is_lazy(raw_df):
+            # Mode ajout : concaténation et mise à jour incrémentale des statistiques
+            st.session_state.df_source = source
+            try:
+                st.session_state.df = append_data(current_df, raw_df)
+                st.success(f"✅ {uploaded_file.name} ajouté : +{len(raw_df):,} lignes "
+                           f"(total {len(st.session_state.df):,} lignes)")
+            except ValueError as e:
+                st.error(f"Ajout impossible : {e}")
+        elif raw_df is not None:
             st.session_state.df = df_manager(raw_df)
-            st.success(f"✅ {uploaded_file.name} chargé avec succès ! ({len(raw_df):,} lignes × {len(raw_df.columns)} colonnes)")
+            st.session_state.df_source = source
+            if is_lazy(raw_df):
+                st.success(f"✅ {uploaded_file.name} ouvert en mode grand volume ({raw_df.npartitions} partitions × {len(raw_df.columns)} colonnes)")
+            else:
+                st.success(f"✅ {uploaded_file.name} chargé avec succès ! ({len(raw_df):,} lignes × {len(raw_df.columns)} colonnes)")
 
 df = st.session_state.df
 
@@ -64,6 +113,13 @@ if df is None:
     st.info("👆 Utilisez la barre latérale pour charger un fichier et commencer l'analyse.")
     st.stop()
 
+# Mode grand volume (Dask) ou source SQL : tableau de bord et analyses hors mémoire, Machine
+# Learning et exportations sur un échantillon collecté en mémoire
+backend = get_backend(df)
+if is_lazy(df):
+    st.info(f"Mode grand volume : Machine Learning et exportations sur un échantillon de {len(backend.sample(df)):,} lignes "
+            "(prévisions sur les données complètes).")
+
 # Onglets principaux
 tab1, tab2, tab3, tab4 = st.tabs(["📊 Tableau de bord", "🔍 Analyses", "🤖 Machine Learning", "📄 Exportations"])
 
@@ -81,7 +137,7 @@ with tab3:
 
 with tab4:
     from pages.export import main as export_main
-    export_main(df)
+    export_main(backend.sample(df))
 
 # Footer
 st.markdown("---")
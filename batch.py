@@ -0,0 +1,133 @@
+# batch.py
+# Traitement par lots sans interface : statistiques du tableau de bord + rapports PDF/Excel
+# Usage : python batch.py uploaded_data --output rapports --workers 4 --formats pdf excel
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from config.settings import BATCH_OUTPUT_FOLDER, BATCH_MAX_WORKERS
+from core.backend import get_backend, is_lazy
+from core.data_loader import read_file, SUPPORTED_EXTENSIONS
+from core.stats import compute_dashboard_stats
+
+def list_input_files(input_dir, recursive=False):
+    pattern = "**/*" if recursive else "*"
+    return sorted(p for p in Path(input_dir).glob(pattern)
+                  if p.is_file() and p.name.lower().endswith(SUPPORTED_EXTENSIONS))
+
+def report_path(path, input_dir, output_dir, extension):
+    """Chemin du rapport : sous-dossiers de l'entrée reproduits et extension source gardée dans
+    le nom (ventes.csv → ventes_csv.xlsx, distinct du rapport de ventes.xlsx)"""
+    relative = Path(path).relative_to(input_dir)
+    suffix = relative.suffix.lstrip(".").lower()
+    return Path(output_dir) / relative.parent / f"{relative.stem}_{suffix}.{extension}"
+
+def process_file(path, input_dir, output_dir, formats, input_files=frozenset()):
+    """Traite un fichier (exécuté dans un processus de travail) et retourne ses temps d'exécution.
+
+    `input_files` : chemins résolus des fichiers d'entrée, jamais écrasés par un rapport.
+    """
+    result = {"fichier": str(Path(path).relative_to(input_dir)), "statut": "ok", "lignes": None, "colonnes": None}
+    start = time.perf_counter()
+    try:
+        targets = {fmt: report_path(path, input_dir, output_dir, "pdf" if fmt == "pdf" else "xlsx")
+                   for fmt in formats}
+        for target in targets.values():
+            if target.resolve() in input_files:
+                raise ValueError(f"le rapport {target} écraserait un fichier d'entrée")
+            target.parent.mkdir(parents=True, exist_ok=True)
+
+        # Import local : WeasyPrint / Plotly ne sont chargés que dans les processus de travail
+        from pages.export import generate_pdf_report, generate_excel_report
+
+        t0 = time.perf_counter()
+        df = read_file(path)
+        backend = get_backend(df)
+        result["chargement (s)"] = time.perf_counter() - t0
+        # Mode grand volume (Dask) : nombre de lignes calculé par le moteur, pas par df.shape
+        result["lignes"], result["colonnes"] = backend.count(df), len(df.columns)
+
+        t0 = time.perf_counter()
+        stats = compute_dashboard_stats(df, backend)
+        result["statistiques (s)"] = time.perf_counter() - t0
+
+        # Rapports sur l'échantillon en mémoire (comme l'interface), statistiques exactes
+        report_df = backend.sample(df) if is_lazy(df) else df
+
+        if "pdf" in formats:
+            t0 = time.perf_counter()
+            generate_pdf_report(report_df, output_path=str(targets["pdf"]))
+            result["pdf (s)"] = time.perf_counter() - t0
+
+        if "excel" in formats:
+            t0 = time.perf_counter()
+            with open(targets["excel"], "wb") as f:
+                f.write(generate_excel_report(report_df, stats=stats))
+            result["excel (s)"] = time.perf_counter() - t0
+    except Exception as e:
+        result["statut"] = f"erreur : {e}"
+    result["total (s)"] = time.perf_counter() - start
+    return result
+
+def run_batch(input_dir, output_dir=BATCH_OUTPUT_FOLDER, workers=BATCH_MAX_WORKERS,
+              formats=("pdf", "excel"), recursive=False):
+    files = list_input_files(input_dir, recursive=recursive)
+    output_dir = Path(output_dir)
+    input_files = frozenset(path.resolve() for path in files)
+    summary_path = output_dir / "resume_batch.csv"
+    if summary_path.resolve() in input_files:
+        raise ValueError(f"Le résumé {summary_path} écraserait un fichier d'entrée")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_file, path, input_dir, output_dir, formats, input_files): path for path in files}
+        for future in as_completed(futures):
+            result = future.result()
+            print(f"[{len(results) + 1}/{len(files)}] {result['fichier']} – {result['statut']} "
+                  f"({result['total (s)']:.2f} s)", flush=True)
+            results.append(result)
+
+    summary = pd.DataFrame(results)
+    if not summary.empty:
+        summary = summary.sort_values("fichier").reset_index(drop=True)
+        summary.to_csv(summary_path, index=False)
+    return summary, time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère statistiques et rapports pour un dossier de fichiers.")
+    parser.add_argument("input_dir", help="Dossier contenant les fichiers CSV / Excel / Parquet")
+    parser.add_argument("-o", "--output", default=BATCH_OUTPUT_FOLDER, help="Dossier de sortie des rapports")
+    parser.add_argument("-w", "--workers", type=int, default=BATCH_MAX_WORKERS,
+                        help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("-f", "--formats", nargs="+", choices=["pdf", "excel"], default=["pdf", "excel"],
+                        help="Rapports à produire")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Parcourt les sous-dossiers")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"Dossier introuvable : {args.input_dir}")
+
+    try:
+        summary, elapsed = run_batch(args.input_dir, args.output, args.workers, args.formats, args.recursive)
+    except ValueError as e:
+        parser.error(str(e))
+    if summary.empty:
+        print("Aucun fichier supporté trouvé.")
+        return 1
+
+    print()
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    errors = int((summary["statut"] != "ok").sum())
+    print(f"\n{len(summary)} fichier(s) traité(s) en {elapsed:.2f} s – {errors} erreur(s)")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
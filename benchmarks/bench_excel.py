@@ -0,0 +1,74 @@
+# benchmarks/bench_excel.py
+# Compare la lecture Excel actuelle (pd.read_excel, openpyxl) au lecteur core.excel_reader
+# Usage : python benchmarks/bench_excel.py --rows 200000 --sheets 4 [--file classeur.xlsx]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.excel_reader import CALAMINE_AVAILABLE, list_sheets, read_excel_sheets
+
+def build_workbook(path, rows, n_sheets):
+    """Classeur synthétique type ventes (dates, catégories, montants)"""
+    rng = np.random.default_rng(0)
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for i in range(n_sheets):
+            pd.DataFrame({
+                "Date": pd.date_range("2024-01-01", periods=rows, freq="min"),
+                "Produit": rng.choice(["Surface Pro", "Uniqlo Jeans", "H&M T-Shirt"], rows),
+                "Région": rng.choice(["Akanda", "Moanda", "Libreville"], rows),
+                "Prix": rng.integers(1_000, 2_000_000, rows),
+                "Quantité": rng.integers(1, 10, rows),
+                "Client_Age": rng.normal(40, 12, rows).round(),
+            }).to_excel(writer, sheet_name=f"Mois_{i + 1}", index=False)
+
+def timed(label, fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<45} {best:8.2f} s")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", help="Classeur existant (sinon généré)")
+    parser.add_argument("--rows", type=int, default=100_000, help="Lignes par feuille générée")
+    parser.add_argument("--sheets", type=int, default=4, help="Nombre de feuilles générées")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    path = args.file
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench.xlsx")
+        print(f"Génération de {args.sheets} feuilles × {args.rows:,} lignes...")
+        build_workbook(path, args.rows, args.sheets)
+    print(f"Fichier : {path} ({os.path.getsize(path) / 1024**2:.1f} Mo) – calamine : {CALAMINE_AVAILABLE}\n")
+
+    timed("Liste des feuilles (openpyxl read_only)", lambda: list_sheets(path, "openpyxl"), args.repeat)
+    if CALAMINE_AVAILABLE:
+        timed("Liste des feuilles (calamine)", lambda: list_sheets(path, "calamine"), args.repeat)
+
+    sheets = list_sheets(path)
+    timed("Actuel : pd.read_excel (1re feuille)", lambda: pd.read_excel(path), args.repeat)
+    timed("Actuel : pd.read_excel (toutes, séquentiel)", lambda: pd.read_excel(path, sheet_name=None), args.repeat)
+    timed("openpyxl read_only (1re feuille)",
+          lambda: read_excel_sheets(path, sheets[:1], engine="openpyxl"), args.repeat)
+    timed("openpyxl read_only (toutes, parallèle)",
+          lambda: read_excel_sheets(path, sheets, engine="openpyxl"), args.repeat)
+    if CALAMINE_AVAILABLE:
+        timed("calamine (1re feuille)", lambda: read_excel_sheets(path, sheets[:1], engine="calamine"), args.repeat)
+        timed("calamine (toutes, séquentiel)",
+              lambda: read_excel_sheets(path, sheets, engine="calamine", max_workers=1), args.repeat)
+        timed("calamine (toutes, parallèle)",
+              lambda: read_excel_sheets(path, sheets, engine="calamine"), args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,16 @@ SAMPLE_DATA_OPTIONS = {
 
 UPLOAD_FOLDER = "uploaded_data"
 DATA_EXAMPLE_FOLDER = "data_examples"
-MAX_FILE_SIZE_MB = 200  # Limite taille fichier
+MAX_FILE_SIZE_MB = 200  # Limite taille fichier (envoi par l'interface : server.maxUploadSize de Streamlit)
+
+# Lecture Excel
+EXCEL_ENGINE = "auto"  # "auto" (calamine si installé), "calamine" ou "openpyxl"
+EXCEL_MAX_WORKERS = None  # Feuilles lues en parallèle (None = nombre de cœurs)
+
+# Détection automatique des types (dates, nombres en texte, virgule décimale)
+TYPE_INFERENCE_ENABLED = True
+TYPE_INFERENCE_SAMPLE_SIZE = 1000  # Valeurs échantillonnées par colonne pour deviner le format
+TYPE_INFERENCE_THRESHOLD = 0.95  # Part minimale de valeurs reconnues sur l'échantillon (la conversion ne perd ensuite aucune valeur)
 
 DARK_THEME_CSS = """
 <style>
@@ -31,6 +40,88 @@ LIGHT_THEME_CSS = """
 </style>
 """
 
+# Moteur de calcul des statistiques, filtres, fréquences et corrélations
+COMPUTE_BACKEND = "pandas"  # "pandas" ou "polars" (multi-thread, nécessite polars)
+
+# Mode grand volume (Dask, hors mémoire, sur une seule machine)
+LARGE_DATASET_THRESHOLD_MB = 500  # CSV / Parquet au-delà : chargement partitionné paresseux (batch.py ; au-dessus de MAX_FILE_SIZE_MB, jamais atteint par un envoi)
+DASK_BLOCKSIZE = "64MB"  # Taille des partitions CSV
+DASK_SCHEDULER = "threads"  # "threads" ou "processes" (ordonnanceur local, sans cluster)
+DASK_SAMPLE_ROWS = 100_000  # Lignes collectées pour les graphiques et statistiques approchées
+
+# Sources SQLite / Parquet interrogées sur place (core/sources.py)
+SQL_SCHEMA_ROWS = 1000  # Premières lignes lues pour déterminer les types des colonnes
+SQL_SAMPLE_ROWS = 100_000  # Lignes ramenées pour les graphiques et statistiques approchées
+SQL_CACHE_ENTRIES = 128  # Résultats de requêtes gardés en cache
+
+# Séries temporelles (agrégations multi-résolution)
+TS_MAX_POINTS = 2000  # Budget de points affichés par courbe
+TS_MARKERS_MAX_POINTS = 500  # Marqueurs affichés seulement en dessous de ce nombre de points
+TS_CACHE_ENTRIES = 16  # Jeux de rollups gardés en cache
+
+# Fréquences des variables catégorielles
+FREQ_CACHE_ENTRIES = 256  # Colonnes dont les codes de modalités restent en cache
+FREQ_OTHER_LABEL = "Autres"  # Modalité regroupant les valeurs hors top N
+FREQ_PIE_TOP_N = 12  # Parts affichées dans les secteurs / donuts
+
+# Valeurs aberrantes (core/outliers.py)
+OUTLIER_IQR_FACTOR = 1.5  # Bornes Q1 - k·IQR / Q3 + k·IQR
+OUTLIER_Z_THRESHOLD = 3.5  # Seuil du z-score robuste (médiane / MAD)
+OUTLIER_ISOLATION_FOREST = True  # Score multivarié par ligne (scikit-learn)
+OUTLIER_CONTAMINATION = "auto"  # Proportion attendue d'anomalies pour l'Isolation Forest
+OUTLIER_CACHE_ENTRIES = 8  # Jeux de drapeaux gardés en cache
+
+# Pipeline de nettoyage (core/data_cleaner.py)
+CLEAN_CHUNK_ROWS = 1_000_000  # Taille des blocs de lignes pour les transformations élément par élément
+CLEAN_CACHE_ENTRIES = 8  # Résultats (jeu de données, recette) gardés en cache
+
+# Grille de données paginée côté serveur (ui/data_grid.py)
+GRID_PAGE_SIZES = [50, 100, 250, 1000]  # Lignes envoyées au navigateur par page
+GRID_CACHE_ENTRIES = 16  # Ordres de tri / filtres gardés en cache
+GRID_HEIGHT = 450  # Hauteur de la grille (px)
+
+# Calculs lourds en arrière-plan (pairplot, Spearman, Machine Learning)
+SCHEDULER_MAX_WORKERS = None  # Processus du pool partagé ; None = nombre de cœurs disponibles
+SCHEDULER_START_METHOD = "forkserver"  # Démarrage des processus : "forkserver" ou "spawn" (pas de fork d'un serveur multi-thread)
+SCHEDULER_MAX_TASKS_PER_SESSION = 2  # Calculs simultanés autorisés par utilisateur
+SCHEDULER_POLL_SECONDS = 1.0  # Intervalle de rafraîchissement de l'indicateur d'attente
+SCHEDULER_RESULT_ENTRIES = 32  # Résultats terminés conservés (reruns, autres sessions)
+
+# Rapports PDF (ui/report_generator.py)
+REPORT_MAX_TABLE_ROWS = 50  # Lignes par tableau (résumés, top N, échantillons)
+REPORT_MAX_TABLE_COLUMNS = 12  # Colonnes par tableau
+REPORT_TOP_N = 10  # Modalités par table de fréquences
+REPORT_MAX_FREQUENCY_TABLES = 10  # Colonnes catégorielles détaillées
+REPORT_CHART_MAX_POINTS = 5000  # Points des graphiques point par point (taille des SVG)
+REPORT_MAX_SECONDS = 60  # Budget de durée : sections suivantes omises au-delà
+REPORT_MAX_HTML_BYTES = 5 * 1024 ** 2  # Budget de taille du document HTML
+
+# Mode progressif : échantillon d'abord, valeurs exactes en arrière-plan (core/sampling.py)
+PROGRESSIVE_MODE = True  # False = toujours attendre les valeurs exactes
+PROGRESSIVE_THRESHOLD_ROWS = 1_000_000  # Lignes au-delà desquelles l'échantillon est affiché d'abord
+PROGRESSIVE_SAMPLE_ROWS = 100_000  # Taille visée de l'échantillon stratifié
+PROGRESSIVE_CONFIDENCE = 0.95  # Niveau des intervalles de confiance (moyennes, corrélations)
+PROGRESSIVE_MAX_STRATA = 50  # Modalités maximales de la colonne de stratification
+
+# Associations entre variables qualitatives (core/associations.py)
+ASSOC_MAX_WORKERS = None  # Threads du calcul par paire ; None = valeur par défaut de Python
+ASSOC_DENSE_CELLS = 4_000_000  # Cellules max d'une table de contingence dense (au-delà : tri des cellules présentes)
+ASSOC_CACHE_ENTRIES = 8  # Matrices gardées en cache
+
+# Traitement par lots (batch.py)
+BATCH_OUTPUT_FOLDER = "rapports"
+BATCH_MAX_WORKERS = None  # None = nombre de cœurs disponibles
+
+# Prévisions de séries temporelles par groupe (core/forecasting.py)
+FORECAST_HORIZON = 12  # Périodes prévues par défaut
+FORECAST_ALPHA = 0.05  # Intervalle de prédiction à 95 %
+FORECAST_MIN_POINTS = 8  # Périodes minimales pour ajuster une série
+FORECAST_MAX_WORKERS = None  # Processus d'ajustement ; None = nombre de cœurs disponibles
+FORECAST_BATCH_SIZE = 50  # Séries ajustées par tâche (limite le coût d'envoi aux processus)
+FORECAST_CACHE_ENTRIES = 5000  # Modèles ajustés (paramètres) gardés en cache
+FORECAST_SARIMAX_ORDER = (1, 1, 1)  # (p, d, q)
+FORECAST_SARIMAX_SEASONAL_ORDER = (0, 1, 1)  # (P, D, Q), période selon la fréquence
+
 # ML configs
 ML_TARGET_DEFAULT = None
 ML_THRESHOLD = 0.5
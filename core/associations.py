@@ -0,0 +1,112 @@
+# core/associations.py
+# Matrice d'association entre variables de tous types :
+# - qualitative × qualitative : V de Cramér, χ² = n·(Σ n_ij² / (n_i·n_j) − 1) depuis une table de
+#   contingence comptée par np.bincount sur les codes combinés (cellules non vides seulement si la
+#   table dense est trop grande – hautes cardinalités) ;
+# - qualitative × quantitative : rapport de corrélation η (variance inter-groupes / variance totale) ;
+# - quantitative × quantitative : corrélation de Pearson.
+# Les codes et effectifs marginaux sont calculés une fois par colonne, les paires réparties sur
+# un pool de threads et la matrice est mise en cache par version du jeu de données.
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.settings import ASSOC_MAX_WORKERS, ASSOC_DENSE_CELLS, ASSOC_CACHE_ENTRIES
+from core.cache import dataset_version
+
+def _codes(series):
+    """(codes avec -1 pour les manquants, nombre de modalités, effectifs par modalité ou None si manquants)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, k = series.cat.codes.to_numpy().astype(np.intp), len(series.cat.categories)
+    else:
+        codes, uniques = pd.factorize(series, sort=False)
+        codes, k = codes.astype(np.intp, copy=False), len(uniques)
+    # Effectifs marginaux réutilisés par toutes les paires quand la colonne est complète
+    counts = np.bincount(codes, minlength=k) if len(codes) and codes.min() >= 0 else None
+    return codes, k, counts
+
+def cramers_v(a, ka, row, b, kb, col, dense_cells=ASSOC_DENSE_CELLS):
+    """V de Cramér entre deux colonnes codées (codes, cardinalité, effectifs ou None)"""
+    if row is None or col is None:
+        valid = (a >= 0) & (b >= 0)
+        a, b = a[valid], b[valid]
+        row, col = np.bincount(a, minlength=ka), np.bincount(b, minlength=kb)
+    n = len(a)
+    if n == 0:
+        return np.nan
+    if ka * kb <= min(dense_cells, 4 * n):
+        cells = np.bincount(a * kb + b, minlength=ka * kb)
+        present = np.flatnonzero(cells)
+        cells, i, j = cells[present], present // kb, present % kb
+    else:
+        # Table creuse (hautes cardinalités) : tri des clés combinées, seules les cellules
+        # présentes sont comptées ; clés 32 bits quand elles tiennent (tri deux fois plus rapide)
+        dtype = np.int32 if ka * kb < 2 ** 31 else np.int64
+        keys = np.sort(a.astype(dtype) * dtype(kb) + b.astype(dtype))
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        cells = np.diff(np.r_[starts, n])
+        keys = keys[starts]
+        i = keys // dtype(kb)
+        j = keys - i * dtype(kb)
+    chi2 = n * (np.sum(cells * (cells / (row[i] * col[j]))) - 1)
+    k = min(np.count_nonzero(row), np.count_nonzero(col)) - 1
+    if k <= 0:
+        return np.nan
+    return float(np.sqrt(max(chi2, 0) / (n * k)))
+
+def correlation_ratio(codes, k, _counts, values):
+    """Rapport de corrélation η entre une colonne codée et une colonne numérique"""
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    if len(values) < 2:
+        return np.nan
+    counts = np.bincount(codes, minlength=k)
+    sums = np.bincount(codes, weights=values, minlength=k)
+    mean = values.mean()
+    total = np.sum((values - mean) ** 2)
+    if total == 0:
+        return np.nan
+    present = counts > 0
+    between = np.sum((sums[present] / counts[present] - mean) ** 2 * counts[present])
+    return float(np.sqrt(between / total))
+
+def association_matrix(df, categorical_cols, numeric_cols, max_workers=ASSOC_MAX_WORKERS):
+    """Matrice symétrique (qualitatives puis quantitatives) : V de Cramér, η, Pearson"""
+    columns = list(categorical_cols) + list(numeric_cols)
+    matrix = np.eye(len(columns))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        coded = dict(zip(categorical_cols, pool.map(lambda col: _codes(df[col]), categorical_cols)))
+        values = {col: df[col].to_numpy(dtype=float, na_value=np.nan) for col in numeric_cols}
+
+        def pair(cols):
+            a, b = cols
+            if a in coded and b in coded:
+                return cramers_v(*coded[a], *coded[b])
+            if a in coded:
+                return correlation_ratio(*coded[a], values[b])
+            return np.nan  # Paires numériques : matrice de Pearson calculée en une fois
+
+        pairs = list(combinations(range(len(columns)), 2))
+        for (i, j), value in zip(pairs, pool.map(lambda ij: pair((columns[ij[0]], columns[ij[1]])), pairs)):
+            matrix[i, j] = matrix[j, i] = value
+
+    if len(numeric_cols) >= 2:
+        start = len(categorical_cols)
+        matrix[start:, start:] = df[list(numeric_cols)].corr(method='pearson').to_numpy()
+    return pd.DataFrame(matrix, index=columns, columns=columns)
+
+@st.cache_data(show_spinner="Calcul des associations entre variables...", max_entries=ASSOC_CACHE_ENTRIES)
+def _cached_associations(_df, version, categorical_cols, numeric_cols):
+    return association_matrix(_df, list(categorical_cols), list(numeric_cols))
+
+def associations(df, categorical_cols=None, numeric_cols=None):
+    """Matrice d'association en cache par version (toutes les colonnes qualitatives / numériques par défaut)"""
+    if categorical_cols is None:
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    if numeric_cols is None:
+        numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    return _cached_associations(df, dataset_version(df), tuple(categorical_cols), tuple(numeric_cols))
@@ -0,0 +1,558 @@
+# core/backend.py
+# Moteurs de calcul interchangeables pour les statistiques, filtres, fréquences et corrélations.
+# pandas reste le moteur par défaut ; Polars (Arrow, multi-thread, lazy) est sélectionnable via
+# COMPUTE_BACKEND dans config/settings.py. Les DataFrames Dask (mode grand volume) utilisent
+# automatiquement le moteur Dask, les sources SQLite / Parquet (core.sources) le moteur SQL
+# (requêtes poussées au moteur de la source). Les résultats sont toujours rendus en pandas
+# (frontière Plotly / Streamlit).
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.settings import (
+    COMPUTE_BACKEND, FREQ_OTHER_LABEL, DASK_SCHEDULER, DASK_SAMPLE_ROWS, SQL_SAMPLE_ROWS, SQL_CACHE_ENTRIES
+)
+from core import stats
+from core.cache import dataset_version, mask_key, running_stats
+from core.frequency import value_counts as cached_value_counts, frequency_table as cached_frequency_table
+from core.sources import SqlFrame, execute, quote_name
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+try:
+    import dask
+    import dask.dataframe as dd
+    DASK_AVAILABLE = True
+except ImportError:
+    DASK_AVAILABLE = False
+
+# === Filtres (spécification commune à tous les moteurs) ===
+def between(col, low, high):
+    return {"op": "between", "col": col, "value": (low, high)}
+
+def isin(col, values, missing=False):
+    """Modalités retenues ; missing=True garde aussi les valeurs manquantes"""
+    return {"op": "isin", "col": col, "value": list(values), "missing": missing}
+
+def _isin_mask(series, f):
+    mask = series.isin(f["value"])
+    return mask | series.isna() if f.get("missing") else mask
+
+
+def _top_n(counts, col, top_n=None, other=False):
+    """Garde les top_n modalités (comptes triés) ; other=True ajoute la modalité « Autres »"""
+    if top_n is not None and len(counts) > top_n:
+        rest = counts.iloc[top_n:].sum()
+        counts = counts.iloc[:top_n]
+        if other:
+            counts = pd.concat([counts, pd.Series({FREQ_OTHER_LABEL: rest}, name="count")])
+            counts.index.name = col
+    return counts
+
+def _frequency_frame(counts, total):
+    return pd.DataFrame({
+        "Valeur": counts.index.astype(str),
+        "Fréquence absolue": counts.values,
+        "Fréquence relative (%)": (counts.values / total * 100).round(2) if total else 0.0
+    })
+
+
+class PandasBackend:
+    name = "pandas"
+    approximate = None  # Statistiques approchées (sur échantillon) pour ce moteur
+
+    def count(self, df):
+        return len(df)
+
+    def sample(self, df, n=None):
+        """Données transmises aux graphiques (le DataFrame complet en mémoire)"""
+        return df
+
+    def numeric_bounds(self, df, numeric_cols):
+        return df[numeric_cols].min(), df[numeric_cols].max()
+
+    def temporal_summary(self, df, date_col):
+        return stats.temporal_summary(df, date_col)
+
+    def kpi_summary(self, df):
+        return stats.kpi_summary(df)
+
+    def numeric_summary(self, df, numeric_cols):
+        return stats.numeric_summary(df, numeric_cols)
+
+    def frequency_table(self, df, col, top_n=None, mask=None):
+        return cached_frequency_table(df, col, mask=mask, top_n=top_n)
+
+    def value_counts(self, df, col, mask=None, top_n=None, other=False):
+        return cached_value_counts(df, col, mask=mask, top_n=top_n, other=other)
+
+    def quality_summary(self, df):
+        return stats.quality_summary(df)
+
+    def correlations(self, df, numeric_cols, methods=("pearson", "spearman")):
+        return {method: df[numeric_cols].corr(method=method) for method in methods}
+
+    def filter_mask(self, df, filters):
+        """Masque booléen numpy des lignes retenues (None si aucun filtre)"""
+        mask = None
+        for f in filters:
+            if f["op"] == "between":
+                low, high = f["value"]
+                col_mask = ((df[f["col"]] >= low) & (df[f["col"]] <= high)).to_numpy()
+            else:
+                col_mask = _isin_mask(df[f["col"]], f).to_numpy()
+            mask = col_mask if mask is None else mask & col_mask
+        return mask
+
+
+@st.cache_resource(show_spinner="Conversion Arrow / Polars...", max_entries=4)
+def _cached_polars(_df, version):
+    return pl.from_pandas(_df)
+
+class PolarsBackend(PandasBackend):
+    """Calculs en une passe lazy multi-thread ; le DataFrame Polars est converti une fois par version"""
+    name = "polars"
+
+    def frame(self, df):
+        return _cached_polars(df, dataset_version(df)).lazy()
+
+    def _expr(self, filters):
+        expr = pl.lit(True)
+        for f in filters:
+            if f["op"] == "between":
+                low, high = f["value"]
+                expr = expr & pl.col(f["col"]).is_between(low, high)
+            else:
+                selected = pl.col(f["col"]).is_in(f["value"])
+                expr = expr & (selected | pl.col(f["col"]).is_null() if f.get("missing") else selected)
+        return expr.fill_null(False)
+
+    def _masked(self, df, mask):
+        lf = self.frame(df)
+        if mask is not None:
+            lf = lf.filter(pl.Series(np.asarray(mask, dtype=bool)))
+        return lf
+
+    def numeric_summary(self, df, numeric_cols):
+        exprs = []
+        for col in numeric_cols:
+            c = pl.col(col).cast(pl.Float64)
+            x = c.drop_nulls().abs().sort()
+            n = x.len()
+            ranks = pl.int_range(1, n + 1).cast(pl.Float64)
+            gini = (2 * (ranks * x).sum() / (n * x.sum())) - (n + 1) / n
+            exprs += [
+                c.count().alias(f"{col}|count"),
+                c.mean().alias(f"{col}|mean"),
+                c.std().alias(f"{col}|std"),
+                c.min().alias(f"{col}|min"),
+                *[c.quantile(q, interpolation="linear").alias(f"{col}|{q * 100:g}%") for q in stats.PERCENTILES],
+                c.max().alias(f"{col}|max"),
+                c.drop_nulls().mode().min().alias(f"{col}|mode"),
+                c.skew(bias=False).alias(f"{col}|skewness"),
+                c.kurtosis(fisher=True, bias=False).alias(f"{col}|kurtosis"),
+                c.var().alias(f"{col}|variance"),
+                gini.round(4).alias(f"{col}|Gini"),
+            ]
+        row = self.frame(df).select(exprs).collect().row(0, named=True)
+
+        desc = pd.DataFrame(index=numeric_cols, dtype=float)
+        for key, value in row.items():
+            col, stat = key.rsplit("|", 1)
+            desc.loc[col, stat] = value
+        return stats.finish_summary(desc)
+
+    def value_counts(self, df, col, mask=None, top_n=None, other=False):
+        counts = (self._masked(df, mask).select(pl.col(col)).drop_nulls()
+                  .group_by(col).agg(pl.len().cast(pl.Int64).alias("count"))
+                  .sort(["count", col], descending=[True, False]).collect().to_pandas())
+        return _top_n(counts.set_index(col)["count"], col, top_n, other)
+
+    def frequency_table(self, df, col, top_n=None, mask=None):
+        counts = self.value_counts(df, col, mask=mask, top_n=top_n, other=True)
+        return _frequency_frame(counts, counts.sum())
+
+    def quality_summary(self, df):
+        lf = self.frame(df)
+        n_rows = len(df)
+        # Les NaN des colonnes flottantes sont convertis en null par from_pandas
+        missing = lf.select(pl.all().null_count()).collect().to_pandas().iloc[0]
+        duplicates = n_rows - lf.unique().select(pl.len()).collect().item()
+        return stats.quality_table(df.columns, missing, n_rows, duplicates)
+
+    def correlations(self, df, numeric_cols, methods=("pearson", "spearman")):
+        lf = self.frame(df)
+        has_nulls = lf.select(pl.col(numeric_cols).null_count()).collect().row(0, named=True)
+        # Spearman = Pearson sur les rangs : rang calculé une seule fois par colonne complète
+        complete = [col for col in numeric_cols if not has_nulls[col]]
+        if "spearman" in methods and complete:
+            lf = lf.with_columns([pl.col(col).rank("average").cast(pl.Float64).alias(f"__rang_{col}")
+                                  for col in complete])
+
+        exprs = []
+        for method in methods:
+            for i, a in enumerate(numeric_cols):
+                for b in numeric_cols[i + 1:]:
+                    if has_nulls[a] or has_nulls[b]:
+                        # Observations complètes par paire, comme pandas
+                        keep = pl.col(a).is_not_null() & pl.col(b).is_not_null()
+                        expr = pl.corr(pl.col(a).filter(keep).cast(pl.Float64),
+                                       pl.col(b).filter(keep).cast(pl.Float64), method=method)
+                    elif method == "spearman":
+                        expr = pl.corr(pl.col(f"__rang_{a}"), pl.col(f"__rang_{b}"))
+                    else:
+                        expr = pl.corr(pl.col(a).cast(pl.Float64), pl.col(b).cast(pl.Float64))
+                    exprs.append(expr.alias(f"{method}|{a}|{b}"))
+        row = lf.select(exprs).collect().row(0, named=True) if exprs else {}
+
+        result = {}
+        for method in methods:
+            matrix = pd.DataFrame(np.eye(len(numeric_cols)), index=numeric_cols, columns=numeric_cols)
+            for i, a in enumerate(numeric_cols):
+                for b in numeric_cols[i + 1:]:
+                    matrix.loc[a, b] = matrix.loc[b, a] = row[f"{method}|{a}|{b}"]
+            result[method] = matrix
+        return result
+
+    def filter_mask(self, df, filters):
+        if not filters:
+            return None
+        return self.frame(df).select(self._expr(filters)).collect().to_series().to_numpy()
+
+
+class IncrementalBackend(PandasBackend):
+    """Jeu de données construit par ajouts successifs : statistiques lues dans les agrégats
+    fusionnables (core.running_stats) au lieu d'un recalcul complet"""
+    name = "pandas (incrémental)"
+
+    def __init__(self, running):
+        self.running = running
+
+    def numeric_summary(self, df, numeric_cols):
+        return self.running.numeric_summary(numeric_cols)
+
+    def value_counts(self, df, col, mask=None, top_n=None, other=False):
+        if mask is not None or col not in self.running.frequencies:
+            return super().value_counts(df, col, mask=mask, top_n=top_n, other=other)
+        counts = self.running.value_counts(col)
+        return _top_n(counts[counts > 0], col, top_n, other)
+
+    def frequency_table(self, df, col, top_n=None, mask=None):
+        if mask is not None or col not in self.running.frequencies:
+            return super().frequency_table(df, col, top_n=top_n, mask=mask)
+        counts = self.value_counts(df, col, top_n=top_n, other=True)
+        return _frequency_frame(counts, counts.sum())
+
+    def quality_summary(self, df):
+        return self.running.quality_summary()
+
+    def correlations(self, df, numeric_cols, methods=("pearson", "spearman")):
+        # Seule la corrélation de Pearson est fusionnable ; les rangs (Spearman) sont recalculés
+        result = super().correlations(df, numeric_cols, [m for m in methods if m != "pearson"])
+        if "pearson" in methods:
+            result["pearson"] = self.running.pearson(numeric_cols)
+        return {method: result[method] for method in methods}
+
+    def temporal_summary(self, df, date_col):
+        if date_col not in self.running.daily:
+            return super().temporal_summary(df, date_col)
+        return self.running.temporal_summary(date_col)
+
+    def kpi_summary(self, df):
+        return self.running.kpi_summary()
+
+
+def is_lazy(df):
+    """Données hors mémoire : DataFrame Dask partitionné (mode grand volume) ou source SQL"""
+    return isinstance(df, SqlFrame) or (DASK_AVAILABLE and isinstance(df, dd.DataFrame))
+
+def _dask_compute(*objs):
+    return dask.compute(*objs, scheduler=DASK_SCHEDULER)
+
+@st.cache_data(show_spinner="Calcul partitionné en cours...", max_entries=128)
+def _dask_cached(version, name, key, _fn):
+    return _fn()
+
+class DaskBackend:
+    """Calculs partitionnés hors mémoire (ordonnanceur local) ; seuls les petits résultats
+    (agrégats, échantillons pour les graphiques) sont collectés"""
+    name = "dask"
+    approximate = "mode, indice de Gini et corrélation de Spearman calculés sur un échantillon"
+
+    def _cached(self, df, name, key, fn):
+        return _dask_cached(dataset_version(df), name, key, fn)
+
+    def count(self, df):
+        return self._cached(df, "count", None, lambda: int(_dask_compute(df.shape[0])[0]))
+
+    def sample(self, df, n=DASK_SAMPLE_ROWS):
+        def collect():
+            total = self.count(df)
+            frac = min(1.0, n / total) if total else 1.0
+            return df.sample(frac=frac, random_state=0).compute(scheduler=DASK_SCHEDULER)
+        return self._cached(df, "sample", n, collect)
+
+    def numeric_bounds(self, df, numeric_cols):
+        return self._cached(df, "bounds", tuple(numeric_cols),
+                            lambda: _dask_compute(df[numeric_cols].min(), df[numeric_cols].max()))
+
+    def numeric_summary(self, df, numeric_cols):
+        def compute():
+            sub = df[numeric_cols]
+            desc, skew, kurt, var = _dask_compute(
+                sub.describe(percentiles=stats.PERCENTILES), sub.skew(), sub.kurtosis(), sub.var()
+            )
+            desc = desc.T
+            sample = self.sample(df)
+            desc['mode'] = sample[numeric_cols].mode().iloc[0]
+            desc['skewness'] = skew
+            desc['kurtosis'] = kurt
+            desc['variance'] = var
+            desc['Gini'] = [stats.gini_coefficient(sample[col]) for col in numeric_cols]
+            return stats.finish_summary(desc)
+        return self._cached(df, "numeric_summary", tuple(numeric_cols), compute)
+
+    def value_counts(self, df, col, mask=None, top_n=None, other=False):
+        def compute():
+            series = df[col] if mask is None else df[col][mask]
+            return series.value_counts().compute(scheduler=DASK_SCHEDULER).sort_values(ascending=False)
+        counts = self._cached(df, "value_counts", (col, mask_key(mask)), compute)
+        return _top_n(counts, col, top_n, other)
+
+    def frequency_table(self, df, col, top_n=None, mask=None):
+        counts = self.value_counts(df, col, mask=mask, top_n=top_n, other=True)
+        return _frequency_frame(counts, counts.sum())
+
+    def quality_summary(self, df):
+        def compute():
+            missing, n_rows, n_unique = _dask_compute(df.isna().sum(), df.shape[0], df.drop_duplicates().shape[0])
+            return missing, int(n_rows), int(n_unique)
+        missing, n_rows, n_unique = self._cached(df, "quality", None, compute)
+        return stats.quality_table(df.columns, missing, n_rows, n_rows - n_unique)
+
+    def correlations(self, df, numeric_cols, methods=("pearson", "spearman")):
+        result = {}
+        for method in methods:
+            if method == "pearson":
+                result[method] = self._cached(df, "pearson", tuple(numeric_cols),
+                                              lambda: df[numeric_cols].corr().compute(scheduler=DASK_SCHEDULER))
+            else:
+                # Rangs globaux non disponibles en partitionné : calcul sur l'échantillon
+                result[method] = self.sample(df)[numeric_cols].corr(method=method)
+        return result
+
+    def filter_mask(self, df, filters):
+        """Masque paresseux (Series Dask de booléens) ; None si aucun filtre"""
+        mask = None
+        for f in filters:
+            if f["op"] == "between":
+                low, high = f["value"]
+                col_mask = (df[f["col"]] >= low) & (df[f["col"]] <= high)
+            else:
+                col_mask = _isin_mask(df[f["col"]], f)
+            mask = col_mask if mask is None else mask & col_mask
+        return mask
+
+    def temporal_summary(self, df, date_col):
+        def compute():
+            daily, = _dask_compute(df[date_col].dropna().dt.floor("D").value_counts())
+            return daily.sort_index()
+        daily = self._cached(df, "daily", date_col, compute)
+        if daily.empty:
+            return None
+        monthly = daily.groupby(daily.index.to_period("M")).sum()
+        return {
+            "date_col": date_col,
+            "duration_days": (daily.index[-1] - daily.index[0]).days,
+            "unique_dates": len(daily),
+            "mean_per_day": daily.mean(),
+            "busiest_month": monthly.idxmax().strftime("%m/%Y"),
+        }
+
+    def kpi_summary(self, df):
+        table, _ = self.quality_summary(df)
+        rows = self.count(df)
+        completeness = (1 - table["Valeurs manquantes"].sum() / (rows * len(df.columns))) * 100
+        return {
+            "rows": rows,
+            "columns": len(df.columns),
+            "completeness": completeness,
+            "density": completeness,
+        }
+
+
+@st.cache_data(show_spinner="Requête en cours...", max_entries=SQL_CACHE_ENTRIES)
+def _sql_cached(version, name, key, _fn):
+    return _fn()
+
+class SqlBackend:
+    """Source SQLite / Parquet (core.sources.SqlFrame) : filtres, projection et agrégats
+    traduits en SQL et exécutés par le moteur de la source ; seuls les agrégats et les
+    échantillons (graphiques, statistiques d'ordre) sont ramenés en pandas"""
+    name = "sql"
+    approximate = "percentiles, mode, indice de Gini et corrélation de Spearman calculés sur un échantillon"
+
+    def _cached(self, df, name, key, fn):
+        return _sql_cached(dataset_version(df), name, key, fn)
+
+    def count(self, df):
+        return self._cached(df, "count", None, lambda: int(df.query("COUNT(*)").iloc[0, 0]))
+
+    def sample(self, df, n=SQL_SAMPLE_ROWS):
+        def collect():
+            sql, params = df.sample_sql(n)
+            return df._convert(execute(df.engine, df.location, sql, params))
+        return self._cached(df, "sample", n, collect)
+
+    def numeric_bounds(self, df, numeric_cols):
+        def compute():
+            row = df.query(", ".join(f"MIN({quote_name(c)}), MAX({quote_name(c)})" for c in numeric_cols)).iloc[0]
+            values = row.to_numpy(dtype=float)
+            return pd.Series(values[0::2], index=numeric_cols), pd.Series(values[1::2], index=numeric_cols)
+        return self._cached(df, "bounds", tuple(numeric_cols), compute)
+
+    def _moments(self, df, numeric_cols):
+        """Effectif, moyenne, min, max puis moments centrés d'ordre 2 à 4 (deux passes SQL)"""
+        def compute():
+            first = df.query(", ".join(f"COUNT({quote_name(c)}), AVG({quote_name(c)}), MIN({quote_name(c)}), "
+                                       f"MAX({quote_name(c)})" for c in numeric_cols)).iloc[0].to_numpy(dtype=float)
+            n, mean, minimum, maximum = (first[i::4] for i in range(4))
+            centered = [f"({quote_name(c)} - {float(np.nan_to_num(m))!r})" for c, m in zip(numeric_cols, mean)]
+            second = df.query(", ".join(f"SUM({d} * {d}), SUM({d} * {d} * {d}), SUM({d} * {d} * {d} * {d})"
+                                        for d in centered)).iloc[0].to_numpy(dtype=float)
+            m2, m3, m4 = (second[i::3] for i in range(3))
+            return n, mean, minimum, maximum, m2, m3, m4
+        return self._cached(df, "moments", tuple(numeric_cols), compute)
+
+    def numeric_summary(self, df, numeric_cols):
+        def compute():
+            n, mean, minimum, maximum, m2, m3, m4 = self._moments(df, numeric_cols)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                var = m2 / (n - 1)
+                g1 = np.sqrt(n) * m3 / m2 ** 1.5
+                skew = np.where(n > 2, np.sqrt(n * (n - 1)) / (n - 2) * g1, np.nan)
+                g2 = n * m4 / m2 ** 2 - 3
+                kurt = np.where(n > 3, ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3)), np.nan)
+            sample = self.sample(df)[numeric_cols]
+            desc = pd.DataFrame({"count": n, "mean": mean, "std": np.sqrt(var), "min": minimum}, index=numeric_cols)
+            quantiles = sample.quantile(stats.PERCENTILES).T
+            for q in stats.PERCENTILES:
+                desc[f"{q * 100:g}%"] = quantiles[q]
+            desc["max"] = maximum
+            desc['mode'] = sample.mode().iloc[0]
+            desc['skewness'] = skew
+            desc['kurtosis'] = kurt
+            desc['variance'] = var
+            desc['Gini'] = [stats.gini_coefficient(sample[col]) for col in numeric_cols]
+            return stats.finish_summary(desc)
+        return self._cached(df, "numeric_summary", tuple(numeric_cols), compute)
+
+    def value_counts(self, df, col, mask=None, top_n=None, other=False):
+        def compute():
+            name = quote_name(col)
+            result = df.query(f"{name}, COUNT(*) AS n", filters=(mask or ()) + ({"op": "not_null", "col": col},),
+                              extra=f"GROUP BY {name} ORDER BY n DESC")
+            return pd.Series(result["n"].to_numpy(), index=pd.Index(result[col], name=col), name="count")
+        counts = self._cached(df, "value_counts", (col, mask_key(mask)), compute)
+        return _top_n(counts, col, top_n, other)
+
+    def frequency_table(self, df, col, top_n=None, mask=None):
+        counts = self.value_counts(df, col, mask=mask, top_n=top_n, other=True)
+        return _frequency_frame(counts, counts.sum())
+
+    def quality_summary(self, df):
+        def compute():
+            counts = df.query(", ".join(["COUNT(*)"] + [f"COUNT({quote_name(c)})" for c in df.columns])).iloc[0]
+            n_rows = int(counts.iloc[0])
+            select = ", ".join(quote_name(c) for c in df.columns)
+            clause, params = df.where()
+            unique = execute(df.engine, df.location,
+                             f"SELECT COUNT(*) FROM (SELECT DISTINCT {select} FROM {df.relation} {clause}) AS t", params)
+            missing = pd.Series(n_rows - counts.iloc[1:].to_numpy(dtype="int64"), index=df.columns)
+            return missing, n_rows, int(unique.iloc[0, 0])
+        missing, n_rows, n_unique = self._cached(df, "quality", None, compute)
+        return stats.quality_table(df.columns, missing, n_rows, n_rows - n_unique)
+
+    def _pearson(self, df, numeric_cols):
+        """Pearson par paire (observations complètes) en une passe : sommes centrées sur les
+        moyennes globales ; « x + 0 * y » est NULL dès que y l'est"""
+        _, mean, *_ = self._moments(df, numeric_cols)
+        centered = [f"({quote_name(c)} - {float(np.nan_to_num(m))!r})" for c, m in zip(numeric_cols, mean)]
+        pairs = [(i, j) for i in range(len(numeric_cols)) for j in range(i + 1, len(numeric_cols))]
+        terms = []
+        for i, j in pairs:
+            x, y = centered[i], centered[j]
+            terms += [f"COUNT({x} * {y})", f"SUM({x} + 0 * {y})", f"SUM({y} + 0 * {x})",
+                      f"SUM({x} * {x} + 0 * {y})", f"SUM({y} * {y} + 0 * {x})", f"SUM({x} * {y})"]
+        sums = df.query(", ".join(terms)).iloc[0].to_numpy(dtype=float).reshape(-1, 6)
+        corr = np.eye(len(numeric_cols))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for (i, j), (n, sx, sy, sxx, syy, sxy) in zip(pairs, sums):
+                cov = sxy / n - (sx / n) * (sy / n)
+                corr[i, j] = corr[j, i] = np.clip(cov / np.sqrt((sxx / n - (sx / n) ** 2) * (syy / n - (sy / n) ** 2)), -1, 1)
+        return pd.DataFrame(corr, index=numeric_cols, columns=numeric_cols)
+
+    def correlations(self, df, numeric_cols, methods=("pearson", "spearman")):
+        result = {}
+        for method in methods:
+            if method == "pearson":
+                result[method] = self._cached(df, "pearson", tuple(numeric_cols), lambda: self._pearson(df, numeric_cols))
+            else:
+                # Rangs globaux non calculés en SQL : corrélation sur l'échantillon
+                result[method] = self.sample(df)[numeric_cols].corr(method=method)
+        return result
+
+    def filter_mask(self, df, filters):
+        """Prédicat (tuple de filtres) traduit en clause WHERE ; None si aucun filtre"""
+        return tuple(filters) or None
+
+    def temporal_summary(self, df, date_col):
+        def compute():
+            day = df.day_expr(date_col)
+            result = df.query(f"{day} AS jour, COUNT(*) AS n", filters=({"op": "not_null", "col": date_col},),
+                              extra=f"GROUP BY {day}")
+            daily = pd.Series(result["n"].to_numpy(), index=pd.to_datetime(result["jour"], errors="coerce"))
+            return daily[daily.index.notna()].sort_index()
+        daily = self._cached(df, "daily", date_col, compute)
+        if daily.empty:
+            return None
+        monthly = daily.groupby(daily.index.to_period("M")).sum()
+        return {
+            "date_col": date_col,
+            "duration_days": (daily.index[-1] - daily.index[0]).days,
+            "unique_dates": len(daily),
+            "mean_per_day": daily.mean(),
+            "busiest_month": monthly.idxmax().strftime("%m/%Y"),
+        }
+
+    def kpi_summary(self, df):
+        table, _ = self.quality_summary(df)
+        rows = self.count(df)
+        completeness = (1 - table["Valeurs manquantes"].sum() / (rows * len(df.columns))) * 100 if rows else 0.0
+        return {
+            "rows": rows,
+            "columns": len(df.columns),
+            "completeness": completeness,
+            "density": completeness,
+        }
+
+
+def get_backend(df=None, name=None):
+    """Moteur adapté au DataFrame : Dask pour les données partitionnées, statistiques
+    incrémentales pour un jeu construit en mode ajout, sinon le moteur configuré
+    (COMPUTE_BACKEND) avec repli sur pandas si Polars n'est pas installé"""
+    if isinstance(df, SqlFrame):
+        return SqlBackend()
+    if df is not None and is_lazy(df):
+        return DaskBackend()
+    running = running_stats(df) if df is not None else None
+    if running is not None:
+        return IncrementalBackend(running)
+    name = name or COMPUTE_BACKEND
+    if name == "polars" and POLARS_AVAILABLE:
+        return PolarsBackend()
+    return PandasBackend()
@@ -1,4 +1,10 @@
 # core/cache.py
+import hashlib
+import uuid
+import weakref
+
+import numpy as np
+import pandas as pd
 import streamlit as st
 
 @st.cache_data(show_spinner="Optimisation du cache...", ttl=3600)  # Cache 1 heure
@@ -12,4 +18,62 @@ def df_manager(df, key=None):
 
 @st.cache_resource(show_spinner="Chargement des ressources...")
 def resource_manager(obj):
-    return obj
\ No newline at end of file
+    return obj
+
+# === Versions de jeux de données ===
+# Empreinte calculée une seule fois par objet DataFrame (les DataFrames ne sont pas modifiés
+# sur place dans l'application) : sert de clé aux caches des agrégats (rollups, fréquences...)
+_VERSIONS = {}
+
+def register_version(df, version):
+    """Associe une version connue à un DataFrame (ex. après un ajout incrémental)"""
+    key = id(df)
+    _VERSIONS[key] = version
+    weakref.finalize(df, _VERSIONS.pop, key, None)
+    return version
+
+def dataset_version(df):
+    """Version (empreinte du contenu) d'un DataFrame, mémorisée pour la durée de vie de l'objet"""
+    version = _VERSIONS.get(id(df))
+    if version is not None:
+        return version
+    if hasattr(df, "source_token"):
+        # Source SQL (core.sources) : empreinte des fichiers, de la projection et des filtres
+        return register_version(df, df.source_token)
+    if hasattr(df, "dask"):
+        # DataFrame Dask : jeton déterministe du graphe de calcul (aucune donnée lue)
+        from dask.base import tokenize
+        return register_version(df, tokenize(df))
+    digest = hashlib.sha1(f"{df.shape}{list(df.columns)}{list(df.dtypes)}".encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        version = digest.hexdigest()[:16]
+    except TypeError:  # Cellules non hachables (listes, dict...) : version propre à l'objet
+        version = uuid.uuid4().hex[:16]
+    return register_version(df, version)
+
+def mask_key(mask):
+    """Clé courte d'un masque booléen de filtrage (None = aucune ligne filtrée)"""
+    if mask is None:
+        return "all"
+    if isinstance(mask, tuple):  # Prédicat d'une source SQL (tuple de filtres)
+        return hashlib.sha1(repr(mask).encode()).hexdigest()[:16]
+    if hasattr(mask, "dask"):
+        from dask.base import tokenize
+        return tokenize(mask)
+    mask = np.asarray(mask, dtype=bool)
+    return f"{len(mask)}:{hashlib.sha1(np.packbits(mask).tobytes()).hexdigest()[:16]}"
+
+# === Statistiques fusionnables (mode ajout, core.running_stats) ===
+_RUNNING_STATS = {}
+
+def register_running_stats(df, stats):
+    """Associe des statistiques incrémentales à un DataFrame (durée de vie de l'objet)"""
+    key = id(df)
+    _RUNNING_STATS[key] = stats
+    weakref.finalize(df, _RUNNING_STATS.pop, key, None)
+    return stats
+
+def running_stats(df):
+    """Statistiques incrémentales du DataFrame, ou None hors mode ajout"""
+    return _RUNNING_STATS.get(id(df))
@@ -1,11 +1,167 @@
 # core/data_cleaner.py
+# Pipeline de nettoyage déclaratif : une liste d'étapes (dictionnaires) appliquée colonne par
+# colonne sans copie intermédiaire du DataFrame. Les étapes sur les lignes (doublons, lignes
+# incomplètes) cumulent un masque appliqué une seule fois à la fin ; les transformations
+# élément par élément sont traitées par blocs de lignes sur les gros volumes.
+# Chaque exécution retourne un rapport (durée et lignes affectées par étape).
+import hashlib
+import time
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-def clean_data(df):
+from config.settings import CLEAN_CHUNK_ROWS, CLEAN_CACHE_ENTRIES
+from core.cache import dataset_version, register_version
+from core.type_inference import infer_column
+
+# === Étapes (spécification commune, hachable pour le cache) ===
+def drop_duplicates():
+    return {"op": "drop_duplicates"}
+
+def drop_empty_columns():
+    return {"op": "drop_empty_columns"}
+
+def trim_text():
+    """Supprime les espaces en début / fin de texte ; les textes vides deviennent manquants"""
+    return {"op": "trim_text"}
+
+def coerce_types():
+    """Dates et nombres stockés en texte convertis (core.type_inference)"""
+    return {"op": "coerce_types"}
+
+def fill_missing(numeric="median", text=None, datetime=None):
+    """Stratégie par type : numeric ∈ {zero, mean, median, drop}, text ∈ {mode, empty, drop},
+    datetime ∈ {drop} ; None laisse les valeurs manquantes ; drop supprime les lignes"""
+    return {"op": "fill_missing", "numeric": numeric, "text": text, "datetime": datetime}
+
+def cap_outliers(factor=1.5):
+    """Écrête les valeurs numériques hors [Q1 - k·IQR, Q3 + k·IQR]"""
+    return {"op": "cap_outliers", "factor": factor}
+
+# Recette par défaut : comportement historique de clean_data, sans remplir texte et dates par 0
+DEFAULT_PIPELINE = [drop_duplicates(), drop_empty_columns(), fill_missing(numeric="zero")]
+
+# === Exécution ===
+def _chunked(series, fn, chunk_rows):
+    """Applique fn par blocs de lignes (mémoire temporaire bornée sur les grosses colonnes)"""
+    if len(series) <= chunk_rows:
+        return fn(series)
+    return pd.concat([fn(series.iloc[i:i + chunk_rows]) for i in range(0, len(series), chunk_rows)])
+
+def _kind(series):
+    if pd.api.types.is_bool_dtype(series):
+        return None
+    if pd.api.types.is_numeric_dtype(series):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "datetime"
+    if series.dtype == object or pd.api.types.is_string_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+        return "text"
+    return None
+
+def _trim(values):
+    stripped = values.str.strip()
+    return stripped.mask(stripped == "")
+
+def _fill_value(series, strategy):
+    if strategy == "zero":
+        return 0
+    if strategy == "mean":
+        return series.mean()
+    if strategy == "median":
+        return series.median()
+    if strategy == "mode":
+        mode = series.mode()
+        return mode.iloc[0] if not mode.empty else None
+    if strategy == "empty":
+        return ""
+    raise ValueError(f"Stratégie de remplacement inconnue : {strategy}")
+
+def _apply_step(step, columns, keep, chunk_rows):
+    """Applique une étape sur le dictionnaire de colonnes ; retourne (masque, lignes affectées)"""
+    op = step["op"]
+    affected = np.zeros(len(keep), dtype=bool)
+
+    if op == "drop_duplicates":
+        frame = pd.DataFrame(columns, copy=False)
+        duplicated = np.zeros(len(keep), dtype=bool)
+        duplicated[keep] = frame[keep].duplicated().to_numpy()
+        return keep & ~duplicated, duplicated
+
+    if op == "drop_empty_columns":
+        for col in [col for col, series in columns.items() if not series[keep].notna().any()]:
+            del columns[col]
+        return keep, affected
+
+    for col, series in list(columns.items()):
+        kind = _kind(series)
+        if op == "trim_text" and kind == "text" and not isinstance(series.dtype, pd.CategoricalDtype):
+            new = _chunked(series, _trim, chunk_rows)
+            changed = (new != series).to_numpy() & series.notna().to_numpy()
+        elif op == "coerce_types" and kind == "text":
+            new = infer_column(series)
+            changed = np.full(len(series), new is not series) & series.notna().to_numpy()
+        elif op == "cap_outliers" and kind == "numeric":
+            q1, q3 = series[keep].quantile([.25, .75])
+            low, high = q1 - step["factor"] * (q3 - q1), q3 + step["factor"] * (q3 - q1)
+            changed = ((series < low) | (series > high)).to_numpy()
+            new = _chunked(series, lambda s: s.clip(low, high), chunk_rows) if changed.any() else series
+        elif op == "fill_missing" and kind is not None and step.get(kind) is not None:
+            missing = series.isna().to_numpy()
+            if step[kind] == "drop":
+                affected |= missing & keep  # Lignes déjà supprimées par une étape précédente exclues
+                keep = keep & ~missing
+                continue
+            value = _fill_value(series[keep], step[kind])
+            if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+                series = series.cat.add_categories([value])
+            new = _chunked(series, lambda s: s.fillna(value), chunk_rows) if missing.any() else series
+            changed = missing
+        elif op not in ("trim_text", "coerce_types", "cap_outliers", "fill_missing"):
+            raise ValueError(f"Étape de nettoyage inconnue : {op}")
+        else:
+            continue
+        columns[col] = new
+        affected |= changed & keep
+    return keep, affected
+
+def run_pipeline(df, steps, chunk_rows=CLEAN_CHUNK_ROWS):
+    """Exécute les étapes dans l'ordre ; retourne (DataFrame nettoyé, rapport par étape)"""
+    columns = {col: df[col] for col in df.columns}
+    keep = np.ones(len(df), dtype=bool)
+    report = []
+    for step in steps:
+        t0 = time.perf_counter()
+        keep, affected = _apply_step(step, columns, keep, chunk_rows)
+        report.append({
+            "Étape": step["op"],
+            "Durée (s)": round(time.perf_counter() - t0, 4),
+            "Lignes affectées": int(affected.sum()),
+            "Colonnes restantes": len(columns),
+        })
+    # Une seule construction du résultat (colonnes transformées + sélection des lignes)
+    result = pd.DataFrame(columns, index=df.index, copy=False)
+    if not keep.all():
+        result = result[keep]
+    return result, pd.DataFrame(report)
+
+@st.cache_resource(show_spinner="Nettoyage en cours...", max_entries=CLEAN_CACHE_ENTRIES)
+def _cached_pipeline(_df, version, steps):
+    result, report = run_pipeline(_df, steps)
+    # Version dérivée : les caches en aval (fréquences, rollups...) ne re-hachent pas le résultat
+    register_version(result, hashlib.sha1(f"{version}{steps}".encode()).hexdigest()[:16])
+    return result, report
+
+def clean_pipeline(df, steps):
+    """Pipeline mis en cache par (version du jeu de données, étapes) – ne pas modifier le résultat"""
+    return _cached_pipeline(df, dataset_version(df), steps)
+
+def clean_data(df, steps=None):
     original_shape = df.shape
-    df = df.drop_duplicates()
-    df = df.dropna(axis=1, how='all')  # Supprimer colonnes vides
-    df = df.fillna(0)  # Remplir NaN par 0 (adaptable)
-    st.info(f"Nettoyage : {original_shape[0] - df.shape[0]} doublons supprimés")
-    return df
\ No newline at end of file
+    df, report = clean_pipeline(df, steps or DEFAULT_PIPELINE)
+    st.info(f"Nettoyage : {original_shape[0] - df.shape[0]} lignes et "
+            f"{original_shape[1] - df.shape[1]} colonnes supprimées")
+    with st.expander("Détail des étapes de nettoyage"):
+        st.dataframe(report, use_container_width=True)
+    return df
@@ -1,9 +1,87 @@
 # core/data_loader.py
 import streamlit as st
 import pandas as pd
+import hashlib
 import os
+from config.settings import (
+    TYPE_INFERENCE_ENABLED, TYPE_INFERENCE_SAMPLE_SIZE, LARGE_DATASET_THRESHOLD_MB, DASK_BLOCKSIZE,
+    DASK_SCHEDULER
+)
+from core.cache import dataset_version, register_version, register_running_stats, running_stats
+from core.excel_reader import read_excel
+from core.running_stats import RunningStats
+from core.type_inference import infer_types, infer_plan, apply_plan, plan_losses
 
-def load_data(uploaded_file):
+try:
+    import dask
+    import dask.dataframe as dd
+    DASK_AVAILABLE = True
+except ImportError:
+    DASK_AVAILABLE = False
+
+SUPPORTED_EXTENSIONS = ('.csv', '.xls', '.xlsx', '.parquet')
+LAZY_EXTENSIONS = ('.csv', '.parquet')
+
+def use_lazy(path):
+    """Mode grand volume : CSV / Parquet au-delà de LARGE_DATASET_THRESHOLD_MB"""
+    return (DASK_AVAILABLE and str(path).lower().endswith(LAZY_EXTENSIONS)
+            and os.path.getsize(path) >= LARGE_DATASET_THRESHOLD_MB * 1024 ** 2)
+
+def read_lazy(path, infer=TYPE_INFERENCE_ENABLED):
+    """DataFrame Dask partitionné (rien n'est chargé en mémoire avant un calcul)"""
+    # Types texte de pandas conservés (pas de conversion string[pyarrow]) : mêmes colonnes
+    # catégorielles détectées qu'en mémoire
+    with dask.config.set({"dataframe.convert-string": False}):
+        if str(path).lower().endswith('.csv'):
+            ddf = dd.read_csv(path, blocksize=DASK_BLOCKSIZE, assume_missing=True)
+        else:
+            ddf = dd.read_parquet(path)
+    if infer:
+        # Formats devinés sur la première partition, puis conversion partition par partition
+        head = ddf.head(TYPE_INFERENCE_SAMPLE_SIZE, compute=True)
+        plan = infer_plan(head)
+        if plan:
+            # Une passe de contrôle sur le fichier complet : une colonne dont une valeur ne suit pas
+            # le format deviné (code à zéros de tête, « N/A », autre format de date) reste en texte
+            meta = pd.DataFrame({col: pd.Series(dtype="int64") for col in plan})
+            losses = ddf.map_partitions(plan_losses, plan, meta=meta).sum().compute(scheduler=DASK_SCHEDULER)
+            plan = {col: conversion for col, conversion in plan.items() if losses[col] == 0}
+        if plan:
+            ddf = ddf.map_partitions(apply_plan, plan, meta=apply_plan(head, plan).iloc[:0])
+    return ddf
+
+def read_file(path, sheets=None, infer=TYPE_INFERENCE_ENABLED, lazy=None):
+    """Lit un fichier CSV, Excel ou Parquet depuis le disque (sans Streamlit).
+
+    `sheets` : feuilles Excel à lire (première feuille par défaut).
+    `infer` : détecte les dates et nombres stockés en texte (core.type_inference).
+    `lazy` : DataFrame Dask partitionné ; par défaut selon la taille du fichier (use_lazy).
+    """
+    if lazy is None:
+        lazy = use_lazy(path)
+    if lazy:
+        return read_lazy(path, infer=infer)
+
+    name = str(path).lower()
+    if name.endswith('.csv'):
+        df = pd.read_csv(path)
+    elif name.endswith(('.xls', '.xlsx')):
+        df = read_excel(path, sheets=sheets)
+    elif name.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        raise ValueError(f"Format non supporté : {os.path.basename(str(path))}")
+    return infer_types(df) if infer else df
+
+def file_digest(uploaded_file):
+    """Empreinte du contenu d'un fichier envoyé (calculée une seule fois par envoi)"""
+    digests = st.session_state.setdefault("upload_digests", {})
+    if uploaded_file.file_id not in digests:
+        digests.clear()  # Seul le dernier envoi est conservé
+        digests[uploaded_file.file_id] = hashlib.sha1(uploaded_file.getvalue()).hexdigest()
+    return digests[uploaded_file.file_id]
+
+def load_data(uploaded_file, sheets=None):
     if uploaded_file is None:
         return None
 
@@ -13,18 +91,51 @@ def load_data(uploaded_file):
         with open(save_path, "wb") as f:
             f.write(uploaded_file.getbuffer())
 
-        name = uploaded_file.name.lower()
-        if name.endswith('.csv'):
-            df = pd.read_csv(save_path)
-        elif name.endswith(('.xls', '.xlsx')):
-            df = pd.read_excel(save_path)
-        elif name.endswith('.parquet'):
-            df = pd.read_parquet(save_path)
-        else:
+        if not uploaded_file.name.lower().endswith(SUPPORTED_EXTENSIONS):
             st.error("Format non supporté")
             return None
 
-        return df
+        return read_file(save_path, sheets=sheets)
     except Exception as e:
         st.error(f"Erreur : {e}")
-        return None
\ No newline at end of file
+        return None
+
+# === Mode ajout : concaténation de fichiers de même schéma ===
+def _kind(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return "booléen"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numérique"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "date"
+    return "texte"
+
+def check_schema(df, new_df):
+    """Lève ValueError si new_df n'a pas les mêmes colonnes (et types compatibles) que df"""
+    missing = [col for col in df.columns if col not in new_df.columns]
+    extra = [col for col in new_df.columns if col not in df.columns]
+    if missing or extra:
+        raise ValueError(f"Schéma incompatible – colonnes manquantes : {missing or 'aucune'}, "
+                         f"colonnes en trop : {extra or 'aucune'}")
+    mismatched = [f"{col} ({_kind(df[col].dtype)} / {_kind(new_df[col].dtype)})" for col in df.columns
+                  if _kind(df[col].dtype) != _kind(new_df[col].dtype) and new_df[col].notna().any()]
+    if mismatched:
+        raise ValueError(f"Types incompatibles : {', '.join(mismatched)}")
+
+def append_data(df, new_df):
+    """Ajoute les lignes de new_df à df et met à jour les statistiques incrémentales.
+
+    La version du résultat est dérivée des deux versions (seul new_df est haché) et les
+    statistiques fusionnables (core.running_stats) ne traitent que les nouvelles lignes.
+    """
+    check_schema(df, new_df)
+    new_df = new_df[df.columns]
+    stats = running_stats(df) or RunningStats.from_frame(df)
+    combined = pd.concat([df, new_df], ignore_index=True)
+    register_version(combined, hashlib.sha1(f"{dataset_version(df)}+{dataset_version(new_df)}".encode()).hexdigest()[:16])
+    # Empreintes des lignes (doublons) calculées sur les types du jeu combiné ; celles des lignes
+    # déjà vues sont recalculées si une colonne a changé de type (entiers devenus flottants...)
+    if not combined.dtypes.equals(df.dtypes):
+        stats = stats.rehash(combined.iloc[:len(df)])
+    register_running_stats(combined, stats.append(combined.iloc[len(df):]))
+    return combined
@@ -0,0 +1,107 @@
+# core/excel_reader.py
+# Lecture Excel rapide : liste des feuilles sans chargement complet, sélection de feuilles,
+# lecture parallèle avec calamine si disponible, sinon openpyxl en mode read_only (streaming)
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from config.settings import EXCEL_ENGINE, EXCEL_MAX_WORKERS
+
+try:
+    from python_calamine import CalamineWorkbook
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+SHEET_COLUMN = "Feuille"
+
+def resolve_engine(engine=None):
+    """'calamine' si disponible (ou demandé), sinon 'openpyxl'"""
+    engine = engine or EXCEL_ENGINE
+    if engine == "auto":
+        return "calamine" if CALAMINE_AVAILABLE else "openpyxl"
+    if engine == "calamine" and not CALAMINE_AVAILABLE:
+        return "openpyxl"
+    return engine
+
+def _is_xls(source):
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    return str(name).lower().endswith(".xls")
+
+def list_sheets(source, engine=None):
+    """Noms des feuilles sans lire les cellules (chemin ou fichier uploadé)"""
+    engine = resolve_engine(engine)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    try:
+        if engine == "calamine":
+            if hasattr(source, "read"):
+                return CalamineWorkbook.from_filelike(source).sheet_names
+            return CalamineWorkbook.from_path(str(source)).sheet_names
+        if _is_xls(source):
+            with pd.ExcelFile(source) as xls:
+                return xls.sheet_names
+        from openpyxl import load_workbook
+        wb = load_workbook(source, read_only=True)
+        try:
+            return wb.sheetnames
+        finally:
+            wb.close()
+    finally:
+        if hasattr(source, "seek"):
+            source.seek(0)
+
+def _read_sheet_openpyxl(path, sheet):
+    """Lecture en streaming (read_only) d'une feuille, entête sur la première ligne"""
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = [row for row in wb[sheet].iter_rows(values_only=True)
+                if any(value is not None for value in row)]
+    finally:
+        wb.close()
+    if not rows:
+        return pd.DataFrame()
+    # Même conversion des types que pd.read_excel (nombres stockés en texte, entiers/décimaux mêlés)
+    return TextParser(rows, header=0).read()
+
+def read_sheet(path, sheet, engine=None):
+    """Lit une seule feuille d'un classeur"""
+    engine = resolve_engine(engine)
+    if engine == "calamine":
+        return pd.read_excel(path, sheet_name=sheet, engine="calamine")
+    if _is_xls(path):
+        return pd.read_excel(path, sheet_name=sheet)
+    return _read_sheet_openpyxl(path, sheet)
+
+def read_excel_sheets(path, sheets=None, engine=None, max_workers=EXCEL_MAX_WORKERS):
+    """Lit les feuilles demandées (toutes si None), en parallèle s'il y en a plusieurs.
+
+    Retourne un dict {nom de feuille: DataFrame} dans l'ordre demandé.
+    """
+    engine = resolve_engine(engine)
+    sheets = list(sheets) if sheets else list_sheets(path, engine)
+    if len(sheets) == 1 or max_workers == 1:
+        return {sheet: read_sheet(path, sheet, engine) for sheet in sheets}
+
+    workers = min(len(sheets), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frames = pool.map(read_sheet, [path] * len(sheets), sheets, [engine] * len(sheets))
+        return dict(zip(sheets, frames))
+
+def combine_sheets(frames):
+    """Une feuille : DataFrame tel quel ; plusieurs : concaténation avec la colonne 'Feuille'"""
+    if len(frames) == 1:
+        return next(iter(frames.values()))
+    return pd.concat(
+        [df.assign(**{SHEET_COLUMN: sheet}) for sheet, df in frames.items()],
+        ignore_index=True
+    )
+
+def read_excel(path, sheets=None, engine=None, max_workers=EXCEL_MAX_WORKERS):
+    """Lit une ou plusieurs feuilles (première feuille par défaut) en un seul DataFrame"""
+    if not sheets:
+        sheets = list_sheets(path, engine)[:1]
+    return combine_sheets(read_excel_sheets(path, sheets, engine, max_workers))
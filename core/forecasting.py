@@ -0,0 +1,180 @@
+# core/forecasting.py
+# Prévision de séries temporelles par groupe (une série par magasin, produit...) avec statsmodels :
+# lissage exponentiel (ETS) ou SARIMAX. Les séries régulières sont construites en une agrégation
+# groupée, puis ajustées par lots dans un pool de processus (en série dans une tâche
+# d'arrière-plan, déjà exécutée hors du serveur). Seuls les paramètres estimés sont
+# renvoyés et mis en cache par (version du jeu de données, groupe, paramètres) : le modèle est
+# reconstitué sans nouvelle estimation pour produire la prévision et son intervalle.
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.settings import (
+    FORECAST_MIN_POINTS, FORECAST_MAX_WORKERS, FORECAST_BATCH_SIZE, FORECAST_CACHE_ENTRIES,
+    FORECAST_SARIMAX_ORDER, FORECAST_SARIMAX_SEASONAL_ORDER, DASK_SCHEDULER
+)
+from core.backend import is_lazy
+from core.cache import dataset_version
+from core.sources import SqlFrame, quote_name
+
+MODELS = {"Lissage exponentiel (ETS)": "ets", "SARIMAX": "sarimax"}
+FREQUENCIES = {"Jour": "D", "Semaine": "W", "Mois": "MS"}
+PERIODS = {"D": "D", "W": "W", "MS": "M"}  # Périodes pandas correspondantes (fin de période)
+SEASONAL_PERIODS = {"D": 7, "W": 52, "MS": 12}
+ALL_LABEL = "Ensemble"
+
+def model_spec(model, freq, trend=True, seasonal=True):
+    """Paramètres d'ajustement (hachables : clé du cache des modèles)"""
+    return (("model", model), ("freq", freq), ("trend", trend),
+            ("seasonal_periods", SEASONAL_PERIODS[freq] if seasonal else None),
+            ("order", FORECAST_SARIMAX_ORDER), ("seasonal_order", FORECAST_SARIMAX_SEASONAL_ORDER))
+
+# === Séries régulières ===
+def build_series(df, date_col, value_col, group_col=None, freq="D", agg="sum"):
+    """Séries par groupe, agrégées par période (une seule agrégation groupée) ; les périodes
+    sans observation valent 0 pour une somme et sont interpolées pour une moyenne"""
+    keys = [group_col] if group_col else []
+    data = df[[date_col, value_col] + keys].dropna(subset=[date_col])
+    if agg == "sum" and len(data):
+        # Dernière période incomplète (données arrêtées en cours de mois...) : sa somme partielle,
+        # anormalement basse, fausserait la prévision ; elle est exclue
+        last = data[date_col].max()
+        period = pd.Period(last, freq=PERIODS[freq])
+        if last.normalize() < period.end_time.normalize():
+            data = data[data[date_col] < period.start_time]
+    grouped = data.groupby(keys + [pd.Grouper(key=date_col, freq=freq)], observed=True, sort=True)[value_col].agg(agg)
+
+    def regular(s):
+        s = s.asfreq(freq)
+        return s.fillna(0) if agg == "sum" else s.interpolate(limit_direction="both")
+
+    if not group_col:
+        return {ALL_LABEL: regular(grouped)}
+    return {group: regular(s.droplevel(0)) for group, s in grouped.groupby(level=0, sort=False)}
+
+def _load_columns(df, cols):
+    """Colonnes utiles d'un jeu hors mémoire (source SQL ou Dask) ramenées en pandas"""
+    if isinstance(df, SqlFrame):
+        return df[cols].query(", ".join(quote_name(col) for col in cols))
+    return df[cols].compute(scheduler=DASK_SCHEDULER)
+
+@st.cache_data(show_spinner="Préparation des séries...", max_entries=8)
+def _cached_series(_df, version, date_col, value_col, group_col, freq, agg):
+    if is_lazy(_df):
+        _df = _load_columns(_df, [col for col in (date_col, value_col, group_col) if col])
+    return build_series(_df, date_col, value_col, group_col, freq, agg)
+
+def grouped_series(df, date_col, value_col, group_col=None, freq="D", agg="sum"):
+    """Séries par groupe en cache par version du jeu de données"""
+    return _cached_series(df, dataset_version(df), date_col, value_col, group_col, freq, agg)
+
+# === Ajustement (processus de travail) ===
+def _model(values, start, spec):
+    from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    spec = dict(spec)
+    y = pd.Series(values, index=pd.date_range(start, periods=len(values), freq=spec["freq"]))
+    season = spec["seasonal_periods"]
+    season = season if season and len(y) >= 2 * season else None  # Deux cycles complets au minimum
+    if spec["model"] == "ets":
+        # États initiaux saisonniers par heuristique : seuls les paramètres de lissage sont
+        # optimisés (ajustement dix fois plus rapide, reproductible à partir des données)
+        return ETSModel(y, error="add", trend="add" if spec["trend"] else None, damped_trend=spec["trend"],
+                        seasonal="add" if season else None, seasonal_periods=season,
+                        initialization_method="heuristic" if season else "estimated")
+    return SARIMAX(y, order=spec["order"], trend="c" if spec["trend"] and spec["order"][1] == 0 else None,
+                   seasonal_order=(*spec["seasonal_order"], season) if season else (0, 0, 0, 0))
+
+def fit_series(values, start, spec):
+    """Paramètres estimés d'une série (dict) ; les résultats complets ne sont pas conservés"""
+    if len(values) < FORECAST_MIN_POINTS:
+        raise ValueError(f"série trop courte ({len(values)} périodes, minimum {FORECAST_MIN_POINTS})")
+    result = _model(values, start, spec).fit(disp=False)
+    return {"params": np.asarray(result.params), "aic": float(result.aic), "points": len(values)}
+
+def _fit_batch(batch, spec):
+    fitted = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # Avertissements de convergence : un par série
+        for group, start, values in batch:
+            try:
+                fitted[group] = fit_series(values, start, spec)
+            except Exception as e:  # Série non ajustable : signalée dans le tableau récapitulatif
+                fitted[group] = {"error": str(e), "points": len(values)}
+    return fitted
+
+def fit_groups(series, spec, max_workers=FORECAST_MAX_WORKERS, batch_size=FORECAST_BATCH_SIZE):
+    """Ajuste toutes les séries ({groupe: Series}) par lots dans un pool de processus.
+
+    `max_workers=1` : ajustement en série dans le processus courant (appel depuis une tâche
+    de core.scheduler, déjà exécutée dans un processus de travail).
+    """
+    items = [(group, s.index[0], s.to_numpy(dtype=float)) for group, s in series.items() if len(s)]
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    if len(batches) <= 1 or max_workers == 1:
+        return _fit_batch(items, spec)
+    fitted = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for part in pool.map(_fit_batch, batches, repeat(spec)):
+            fitted.update(part)
+    return fitted
+
+# === Cache des modèles ajustés (processus de l'application) ===
+_MODELS = OrderedDict()
+_MODELS_LOCK = threading.Lock()
+
+def cached_models(version, groups, spec):
+    """(modèles en cache {groupe: paramètres}, groupes à ajuster)"""
+    found, missing = {}, []
+    with _MODELS_LOCK:
+        for group in groups:
+            fitted = _MODELS.get((version, group, spec))
+            if fitted is None:
+                missing.append(group)
+            else:
+                _MODELS.move_to_end((version, group, spec))
+                found[group] = fitted
+    return found, missing
+
+def store_models(version, spec, fitted):
+    with _MODELS_LOCK:
+        for group, params in fitted.items():
+            _MODELS[(version, group, spec)] = params
+        while len(_MODELS) > FORECAST_CACHE_ENTRIES:
+            _MODELS.popitem(last=False)
+
+# === Prévisions ===
+def forecast(series, spec, fitted, horizon, alpha):
+    """Historique et prévision avec intervalle de prédiction (DataFrame indexé par date)"""
+    model = _model(series.to_numpy(dtype=float), series.index[0], spec)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if dict(spec)["model"] == "ets":
+            frame = model.smooth(fitted["params"]).get_prediction(
+                start=len(series), end=len(series) + horizon - 1).summary_frame(alpha=alpha)
+            frame = frame.rename(columns={"pi_lower": "lower", "pi_upper": "upper"})
+        else:
+            frame = model.filter(fitted["params"]).get_forecast(horizon).summary_frame(alpha=alpha)
+            frame = frame.rename(columns={"mean_ci_lower": "lower", "mean_ci_upper": "upper"})
+    result = pd.DataFrame({"historique": series})
+    result = pd.concat([result, pd.DataFrame({"prévision": frame["mean"], "borne basse": frame["lower"],
+                                               "borne haute": frame["upper"]})])
+    # Raccord visuel : la prévision part de la dernière valeur observée
+    result.loc[series.index[-1], "prévision"] = series.iloc[-1]
+    return result.rename_axis("date").reset_index()
+
+def fit_summary(series, fitted):
+    """Récapitulatif par groupe (périodes, total, AIC ou erreur)"""
+    return pd.DataFrame([{
+        "Groupe": group,
+        "Périodes": fitted.get(group, {}).get("points", len(s)),
+        "Total": s.sum(),
+        "AIC": round(fitted[group]["aic"], 1) if "aic" in fitted.get(group, {}) else None,
+        "Statut": fitted.get(group, {}).get("error", "ajusté" if group in fitted else "en attente"),
+    } for group, s in series.items()])
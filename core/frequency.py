@@ -0,0 +1,58 @@
+# core/frequency.py
+# Cache des fréquences de modalités partagé par les graphiques (barres, secteurs, donut) et le
+# tableau de bord : codes de catégories calculés une fois par (version, colonne), puis comptage
+# np.bincount par masque de filtre.
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.settings import FREQ_CACHE_ENTRIES, FREQ_OTHER_LABEL
+from core.cache import dataset_version, mask_key
+
+@st.cache_resource(show_spinner=False, max_entries=FREQ_CACHE_ENTRIES)
+def _cached_codes(_df, version, col):
+    series = _df[col]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series, sort=False)
+
+def category_codes(df, col):
+    """(codes, modalités) de la colonne ; -1 pour les valeurs manquantes"""
+    return _cached_codes(df, dataset_version(df), col)
+
+@st.cache_data(show_spinner=False, max_entries=FREQ_CACHE_ENTRIES * 4)
+def _cached_counts(_df, version, col, key, _mask):
+    codes, uniques = category_codes(_df, col)
+    if _mask is not None:
+        codes = codes[_mask]
+    return np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+def value_counts(df, col, mask=None, top_n=None, other=False):
+    """Équivalent de df[col][mask].value_counts() servi depuis le cache.
+
+    top_n : ne garde que les top_n modalités ; other=True regroupe les suivantes
+    dans une modalité « Autres ».
+    """
+    counts = _cached_counts(df, dataset_version(df), col, mask_key(mask), mask)
+    _, uniques = category_codes(df, col)
+    # Tri stable : même ordre que value_counts pour les ex-aequo (ordre d'apparition)
+    order = np.argsort(-counts, kind="stable")
+    order = order[counts[order] > 0]
+    result = pd.Series(counts[order], index=pd.Index(uniques[order], name=col), name="count")
+    if top_n is not None and len(result) > top_n:
+        rest = result.iloc[top_n:].sum()
+        result = result.iloc[:top_n]
+        if other:
+            result = pd.concat([result, pd.Series({FREQ_OTHER_LABEL: rest}, name="count")])
+            result.index.name = col
+    return result
+
+def frequency_table(df, col, mask=None, top_n=None, other=True):
+    """Table fréquences absolues / relatives (en % des valeurs non manquantes)"""
+    counts = value_counts(df, col, mask=mask, top_n=top_n, other=other)
+    total = _cached_counts(df, dataset_version(df), col, mask_key(mask), mask).sum()
+    return pd.DataFrame({
+        "Valeur": counts.index.astype(str),
+        "Fréquence absolue": counts.values,
+        "Fréquence relative (%)": (counts.values / total * 100).round(2) if total else 0.0
+    })
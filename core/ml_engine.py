@@ -6,33 +6,61 @@ from sklearn.metrics import accuracy_score, mean_squared_error
 from xgboost import XGBClassifier, XGBRegressor
 from config.settings import ML_THRESHOLD
 
-def run_ml(df, target):
+def train_models(df, target):
+    """Entraîne Random Forest et XGBoost sur les variables numériques (sans Streamlit,
+    exécutable dans un processus de travail) et retourne les scores"""
     if target not in df.columns:
-        st.error("Cible non trouvée")
-        return
+        raise ValueError("Cible non trouvée")
 
-    X = df.drop(target, axis=1)
-    y = df[target]
+    data = df.select_dtypes(include='number').drop(columns=target, errors='ignore').join(df[target]).dropna()
+    X = data.drop(target, axis=1)
+    y = data[target]
+    if X.empty or len(data) < 5:
+        raise ValueError("Pas assez de données numériques complètes pour entraîner un modèle")
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
     # Détection auto : classification ou régression
     is_classification = len(y.unique()) < 10  # Arbitrary threshold
+    if is_classification:
+        # XGBoost attend des classes codées 0..n-1
+        classes = {label: code for code, label in enumerate(sorted(y.unique()))}
+        y_train, y_test = y_train.map(classes), y_test.map(classes)
 
     model = RandomForestClassifier() if is_classification else RandomForestRegressor()
     model.fit(X_train, y_train)
     pred = model.predict(X_test)
-
     score = accuracy_score(y_test, pred) if is_classification else mean_squared_error(y_test, pred)
-    st.success(f"Score : {score}")
 
     # XGBoost alternatif
     xgb = XGBClassifier() if is_classification else XGBRegressor()
     xgb.fit(X_train, y_train)
     xgb_pred = xgb.predict(X_test)
     xgb_score = accuracy_score(y_test, xgb_pred) if is_classification else mean_squared_error(y_test, xgb_pred)
-    st.success(f"XGBoost Score : {xgb_score}")
 
+    result = {
+        "is_classification": is_classification,
+        "features": X.columns.tolist(),
+        "score": score,
+        "xgb_score": xgb_score,
+        "positives": None,
+    }
     # Seuil pour classification
     if is_classification:
-        proba = model.predict_proba(X_test)[:, 1]
-        st.write(f"Predictions au seuil {ML_THRESHOLD} : {sum(proba > ML_THRESHOLD)} positives")
\ No newline at end of file
+        proba = model.predict_proba(X_test)[:, -1]
+        result["positives"] = int((proba > ML_THRESHOLD).sum())
+    return result
+
+def show_ml_results(result):
+    metric = "Accuracy" if result["is_classification"] else "MSE"
+    st.success(f"Score ({metric}) : {result['score']}")
+    st.success(f"XGBoost Score ({metric}) : {result['xgb_score']}")
+    if result["positives"] is not None:
+        st.write(f"Predictions au seuil {ML_THRESHOLD} : {result['positives']} positives")
+
+def run_ml(df, target):
+    try:
+        result = train_models(df, target)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    show_ml_results(result)
@@ -0,0 +1,78 @@
+# core/outliers.py
+# Détection des valeurs aberrantes sur toutes les colonnes numériques en une passe vectorisée :
+# IQR et z-score robuste (médiane / MAD) calculés sur la matrice entière, Isolation Forest sur
+# les lignes. Les résultats sont conservés par version du jeu de données sous forme d'un
+# masque de bits uint8 par ligne (un bit par méthode).
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.settings import (
+    OUTLIER_IQR_FACTOR, OUTLIER_Z_THRESHOLD, OUTLIER_ISOLATION_FOREST, OUTLIER_CONTAMINATION, OUTLIER_CACHE_ENTRIES
+)
+from core.cache import dataset_version
+
+IQR, ROBUST_Z, ISOLATION_FOREST = 1, 2, 4
+METHODS = {"IQR": IQR, "Z-score robuste": ROBUST_Z, "Isolation Forest": ISOLATION_FOREST}
+
+def iqr_outliers(X, factor=OUTLIER_IQR_FACTOR):
+    """Matrice booléenne des valeurs hors [Q1 - k·IQR, Q3 + k·IQR] (quantiles de toutes les colonnes en un appel)"""
+    q1, q3 = np.nanquantile(X, [.25, .75], axis=0)
+    iqr = q3 - q1
+    return (X < q1 - factor * iqr) | (X > q3 + factor * iqr)
+
+def robust_z_outliers(X, threshold=OUTLIER_Z_THRESHOLD):
+    """Matrice booléenne des |z robuste| > seuil, z = 0,6745·(x - médiane) / MAD"""
+    median = np.nanmedian(X, axis=0)
+    mad = np.nanmedian(np.abs(X - median), axis=0)
+    # Colonnes de MAD nulle (majorité de valeurs identiques) : z non défini, aucune valeur signalée
+    scale = np.where(mad > 0, mad, np.inf)
+    return 0.6745 * np.abs(X - median) / scale > threshold
+
+def isolation_forest_outliers(X, contamination=OUTLIER_CONTAMINATION):
+    """Lignes isolées par une forêt d'isolement (valeurs manquantes remplacées par la médiane)"""
+    from sklearn.ensemble import IsolationForest  # Import local : scikit-learn est lourd à charger
+    X = np.where(np.isnan(X), np.nanmedian(X, axis=0), X)
+    model = IsolationForest(contamination=contamination, random_state=0, n_jobs=-1)
+    return model.fit_predict(X) == -1
+
+def detect_outliers(df, numeric_cols, isolation_forest=OUTLIER_ISOLATION_FOREST):
+    """Drapeaux par ligne (uint8, un bit par méthode) et table récapitulative par colonne"""
+    X = df[numeric_cols].to_numpy(dtype=float, na_value=np.nan)
+    flags = np.zeros(len(df), dtype=np.uint8)
+    iqr = iqr_outliers(X)
+    robust = robust_z_outliers(X)
+    flags |= np.where(iqr.any(axis=1), IQR, 0).astype(np.uint8)
+    flags |= np.where(robust.any(axis=1), ROBUST_Z, 0).astype(np.uint8)
+    if isolation_forest and len(df) > 1:
+        flags |= np.where(isolation_forest_outliers(X), ISOLATION_FOREST, 0).astype(np.uint8)
+
+    valid = (~np.isnan(X)).sum(axis=0)
+    summary = pd.DataFrame({
+        "Colonne": numeric_cols,
+        "Outliers IQR": iqr.sum(axis=0),
+        "IQR (%)": np.round(iqr.sum(axis=0) / np.maximum(valid, 1) * 100, 2),
+        "Outliers z robuste": robust.sum(axis=0),
+        "Z robuste (%)": np.round(robust.sum(axis=0) / np.maximum(valid, 1) * 100, 2),
+    })
+    return flags, summary
+
+@st.cache_resource(show_spinner="Détection des valeurs aberrantes...", max_entries=OUTLIER_CACHE_ENTRIES)
+def _cached_outliers(_df, version, numeric_cols):
+    return detect_outliers(_df, list(numeric_cols))
+
+def outlier_flags(df):
+    """(drapeaux par ligne, table par colonne) en cache par version – None sans colonne numérique"""
+    numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    if not numeric_cols:
+        return None
+    return _cached_outliers(df, dataset_version(df), tuple(numeric_cols))
+
+def outlier_mask(flags, methods):
+    """Masque des lignes signalées par au moins une des méthodes (noms de METHODS)"""
+    bits = np.uint8(sum(METHODS[name] for name in methods))
+    return (flags & bits) != 0
+
+def rows_by_method(flags):
+    """Nombre de lignes signalées par méthode"""
+    return {name: int(((flags & bit) != 0).sum()) for name, bit in METHODS.items()}
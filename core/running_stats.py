@@ -0,0 +1,231 @@
+# core/running_stats.py
+# Statistiques fusionnables pour l'ajout incrémental de fichiers (mode ajout) : l'ajout de m
+# lignes à un jeu de n lignes ne traite que les m nouvelles lignes, plus des fusions linéaires
+# (insertion dans des tableaux triés) au lieu d'un recalcul complet avec tris.
+# - moments : effectif, moyenne, M2, M3, M4 (Welford / Chan / Pébay), min / max ;
+# - valeurs triées par colonne numérique : percentiles, mode et indice de Gini exacts ;
+# - co-moments décalés par paire de colonnes : corrélation de Pearson (observations complètes par paire) ;
+# - fréquences des modalités, valeurs manquantes, effectifs journaliers, empreintes de lignes (doublons).
+import numpy as np
+import pandas as pd
+
+from core.stats import PERCENTILES, finish_summary, quality_table
+
+def _moments(X):
+    """(effectif, moyenne, M2, M3, M4, min, max) par colonne d'une matrice avec NaN"""
+    valid = ~np.isnan(X)
+    n = valid.sum(axis=0).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(n > 0, np.nansum(X, axis=0) / np.maximum(n, 1), 0.0)
+        dev = np.where(valid, X - mean, 0.0)
+        dev2 = dev * dev
+        minimum = np.where(n > 0, np.nanmin(np.where(valid, X, np.inf), axis=0), np.nan)
+        maximum = np.where(n > 0, np.nanmax(np.where(valid, X, -np.inf), axis=0), np.nan)
+    return n, mean, dev2.sum(axis=0), (dev2 * dev).sum(axis=0), (dev2 * dev2).sum(axis=0), minimum, maximum
+
+def _merge_moments(a, b):
+    """Fusion de deux jeux de moments centrés (formules de Chan et Pébay)"""
+    na, ma, m2a, m3a, m4a, mina, maxa = a
+    nb, mb, m2b, m3b, m4b, minb, maxb = b
+    n = na + nb
+    with np.errstate(invalid="ignore", divide="ignore"):
+        safe = np.maximum(n, 1)
+        d = mb - ma
+        mean = ma + d * nb / safe
+        m2 = m2a + m2b + d ** 2 * na * nb / safe
+        m3 = (m3a + m3b + d ** 3 * na * nb * (na - nb) / safe ** 2
+              + 3 * d * (na * m2b - nb * m2a) / safe)
+        m4 = (m4a + m4b + d ** 4 * na * nb * (na ** 2 - na * nb + nb ** 2) / safe ** 3
+              + 6 * d ** 2 * (na ** 2 * m2b + nb ** 2 * m2a) / safe ** 2
+              + 4 * d * (na * m3b - nb * m3a) / safe)
+    return n, mean, m2, m3, m4, np.fmin(mina, minb), np.fmax(maxa, maxb)
+
+def _insert_sorted(a, b):
+    """Fusion de deux tableaux triés (recherche dichotomique + une copie linéaire)"""
+    return np.insert(a, np.searchsorted(a, b), b)
+
+def _quantile(values, q):
+    """Quantile à interpolation linéaire (comme pandas) sur un tableau trié – O(1)"""
+    if not len(values):
+        return np.nan
+    pos = q * (len(values) - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+def _mode(values):
+    if not len(values):
+        return np.nan
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    lengths = np.diff(np.r_[starts, len(values)])
+    return values[starts[np.argmax(lengths)]]  # Plus petite valeur parmi les plus fréquentes
+
+def _gini(values):
+    """Indice de Gini (valeurs absolues) depuis les valeurs triées, sans nouveau tri complet"""
+    if not len(values):
+        return np.nan
+    split = np.searchsorted(values, 0)
+    # Négatifs (ordre inversé en valeur absolue) et positifs : deux séquences triées à fusionner
+    x = _insert_sorted(values[split:], -values[:split][::-1]) if split else values
+    total = x.sum()
+    if total == 0:
+        return np.nan
+    n = len(x)
+    return round((2 * np.sum(np.arange(1, n + 1) * x) / (n * total)) - (n + 1) / n, 4)
+
+def _row_hashes(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+class RunningStats:
+    """Statistiques d'un jeu de données, mises à jour par ajout de lignes (append)"""
+
+    def __init__(self, columns, numeric_cols, categorical_cols, date_cols, shift):
+        self.columns = list(columns)
+        self.numeric_cols = list(numeric_cols)
+        self.categorical_cols = list(categorical_cols)
+        self.date_cols = list(date_cols)
+        self.shift = shift  # Décalage fixe des co-moments (moyennes du premier lot, stabilité numérique)
+        self.n_rows = 0
+        self.duplicates = 0
+        self.missing = pd.Series(0, index=self.columns, dtype="int64")
+        k = len(self.numeric_cols)
+        self.moments = (np.zeros(k), np.zeros(k), np.zeros(k), np.zeros(k), np.zeros(k),
+                        np.full(k, np.nan), np.full(k, np.nan))
+        self.sorted_values = {col: np.array([], dtype=float) for col in self.numeric_cols}
+        self.co_n, self.co_sum, self.co_cross, self.co_square = (np.zeros((k, k)) for _ in range(4))
+        self.frequencies = {col: pd.Series(dtype="int64") for col in self.categorical_cols}
+        self.daily = {col: pd.Series(dtype="int64") for col in self.date_cols}
+        self.date_bounds = {col: (pd.NaT, pd.NaT) for col in self.date_cols}
+        self.row_hashes = np.array([], dtype=np.uint64)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Statistiques initiales (passe complète unique)"""
+        numeric_cols = df.select_dtypes(include='number').columns.tolist()
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        date_cols = df.select_dtypes(include='datetime').columns.tolist()
+        shift = np.nan_to_num(df[numeric_cols].mean().to_numpy(dtype=float)) if numeric_cols else np.zeros(0)
+        return cls(df.columns, numeric_cols, categorical_cols, date_cols, shift).append(df)
+
+    def copy(self):
+        new = object.__new__(RunningStats)
+        new.__dict__.update(self.__dict__)
+        new.missing = self.missing.copy()
+        new.frequencies = dict(self.frequencies)
+        new.daily = dict(self.daily)
+        new.date_bounds = dict(self.date_bounds)
+        new.sorted_values = dict(self.sorted_values)
+        return new
+
+    def append(self, df):
+        """Nouvelles statistiques après ajout des lignes de df (l'objet courant n'est pas modifié)"""
+        new = self.copy()
+        new.n_rows = self.n_rows + len(df)
+        new.missing = self.missing.add(df[self.columns].isna().sum(), fill_value=0).astype("int64")
+
+        if self.numeric_cols:
+            X = df[self.numeric_cols].to_numpy(dtype=float, na_value=np.nan)
+            new.moments = _merge_moments(self.moments, _moments(X))
+            for i, col in enumerate(self.numeric_cols):
+                batch = np.sort(X[:, i][~np.isnan(X[:, i])])
+                new.sorted_values[col] = _insert_sorted(self.sorted_values[col], batch)
+            # Co-moments par paire sur les lignes où les deux colonnes sont renseignées
+            valid = (~np.isnan(X)).astype(float)
+            shifted = np.where(valid > 0, X - self.shift, 0.0)
+            new.co_n = self.co_n + valid.T @ valid
+            new.co_sum = self.co_sum + shifted.T @ valid
+            new.co_cross = self.co_cross + shifted.T @ shifted
+            new.co_square = self.co_square + (shifted * shifted).T @ valid
+
+        for col in self.categorical_cols:
+            counts = df[col].value_counts(sort=False)
+            new.frequencies[col] = self.frequencies[col].add(counts, fill_value=0).astype("int64")
+        for col in self.date_cols:
+            counts = df[col].dropna().dt.floor("D").value_counts(sort=False)
+            new.daily[col] = self.daily[col].add(counts, fill_value=0).astype("int64").sort_index()
+            low, high = self.date_bounds[col]
+            new.date_bounds[col] = (min(low, df[col].min()) if pd.notna(low) else df[col].min(),
+                                    max(high, df[col].max()) if pd.notna(high) else df[col].max())
+
+        # Doublons : empreintes des lignes déjà vues (tableau trié d'empreintes uniques) ; les
+        # empreintes dépendent des types, df doit avoir ceux du jeu combiné (voir rehash)
+        hashes = np.unique(_row_hashes(df[self.columns]))
+        seen = self.row_hashes
+        pos = np.searchsorted(seen, hashes)
+        known = pos < len(seen)
+        known[known] = seen[pos[known]] == hashes[known]
+        fresh = hashes[~known]
+        new.row_hashes = _insert_sorted(seen, fresh)
+        new.duplicates = self.duplicates + len(df) - len(fresh)
+        return new
+
+    def rehash(self, df):
+        """Empreintes recalculées sur les lignes déjà vues, après conversion d'une colonne vers
+        un type plus large (entiers devenus flottants par l'ajout de valeurs manquantes...)"""
+        new = self.copy()
+        new.row_hashes = np.unique(_row_hashes(df[self.columns]))
+        return new
+
+    # === Résultats (mêmes formats que core.stats) ===
+    def numeric_summary(self, numeric_cols):
+        n, mean, m2, m3, m4, minimum, maximum = self.moments
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = m2 / (n - 1)
+            g1 = np.sqrt(n) * m3 / m2 ** 1.5
+            skew = np.where(n > 2, np.sqrt(n * (n - 1)) / (n - 2) * g1, np.nan)
+            g2 = n * m4 / m2 ** 2 - 3
+            kurt = np.where(n > 3, ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3)), np.nan)
+        desc = pd.DataFrame({"count": n, "mean": mean, "std": np.sqrt(var), "min": minimum},
+                            index=self.numeric_cols)
+        for q in PERCENTILES:
+            desc[f"{q * 100:g}%"] = [_quantile(self.sorted_values[col], q) for col in self.numeric_cols]
+        desc["max"] = maximum
+        desc["mode"] = [_mode(self.sorted_values[col]) for col in self.numeric_cols]
+        desc["skewness"] = skew
+        desc["kurtosis"] = kurt
+        desc["variance"] = var
+        desc["Gini"] = [_gini(self.sorted_values[col]) for col in self.numeric_cols]
+        return finish_summary(desc.loc[list(numeric_cols)])
+
+    def value_counts(self, col):
+        return self.frequencies[col].sort_values(ascending=False, kind="stable").rename_axis(col).rename("count")
+
+    def quality_summary(self):
+        return quality_table(self.columns, self.missing, self.n_rows, self.duplicates)
+
+    def pearson(self, numeric_cols):
+        """Corrélation de Pearson par paire depuis les co-moments décalés"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            n = np.where(self.co_n > 1, self.co_n, np.nan)
+            mean_x, mean_y = self.co_sum / n, self.co_sum.T / n
+            cov = self.co_cross / n - mean_x * mean_y
+            var_x = self.co_square / n - mean_x ** 2
+            var_y = self.co_square.T / n - mean_y ** 2
+            corr = cov / np.sqrt(var_x * var_y)
+        corr = np.clip(corr, -1, 1)
+        np.fill_diagonal(corr, np.where(np.diag(self.co_n) > 1, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.numeric_cols, columns=self.numeric_cols).loc[
+            list(numeric_cols), list(numeric_cols)]
+
+    def temporal_summary(self, date_col):
+        daily = self.daily[date_col]
+        if daily.empty:
+            return None
+        monthly = daily.groupby(daily.index.to_period("M")).sum()
+        return {
+            "date_col": date_col,
+            "duration_days": (self.date_bounds[date_col][1] - self.date_bounds[date_col][0]).days,
+            "unique_dates": len(daily),
+            "mean_per_day": daily.mean(),
+            "busiest_month": monthly.idxmax().strftime("%m/%Y"),
+        }
+
+    def kpi_summary(self):
+        completeness = (1 - self.missing.sum() / (self.n_rows * len(self.columns))) * 100
+        return {
+            "rows": self.n_rows,
+            "columns": len(self.columns),
+            "completeness": completeness,
+            "density": completeness,
+        }
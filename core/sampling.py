@@ -0,0 +1,112 @@
+# core/sampling.py
+# Mode progressif pour les gros jeux de données : résultats immédiats sur un échantillon
+# stratifié (avec intervalles de confiance), remplacés par les valeurs exactes calculées en
+# arrière-plan (core.scheduler). Échantillon tiré en une passe vectorisée (Bernoulli par strate,
+# allocation proportionnelle) et mis en cache par version du jeu de données.
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy import stats as sps
+
+from config.settings import (
+    PROGRESSIVE_MODE, PROGRESSIVE_THRESHOLD_ROWS, PROGRESSIVE_SAMPLE_ROWS, PROGRESSIVE_CONFIDENCE,
+    PROGRESSIVE_MAX_STRATA
+)
+from core.backend import is_lazy
+from core.cache import dataset_version, running_stats
+from core.frequency import category_codes
+
+def use_progressive(df):
+    """Mode progressif actif : jeu en mémoire au-delà du seuil (hors Dask et mode ajout, déjà rapides)"""
+    return (PROGRESSIVE_MODE and df is not None and not is_lazy(df) and running_stats(df) is None
+            and len(df) > PROGRESSIVE_THRESHOLD_ROWS)
+
+def strata_column(df, max_strata=PROGRESSIVE_MAX_STRATA):
+    """Première colonne catégorielle de 2 à max_strata modalités (None sinon)"""
+    for col in df.select_dtypes(include=['object', 'category']).columns:
+        if 2 <= len(category_codes(df, col)[1]) <= max_strata:
+            return col
+    return None
+
+def stratified_positions(df, n, strata_col=None, seed=0):
+    """Positions (triées) d'un échantillon d'environ n lignes, proportionnel aux strates.
+
+    Chaque strate non vide garde au moins une ligne ; les valeurs manquantes forment une strate.
+    """
+    size = len(df)
+    if size <= n:
+        return np.arange(size)
+    keys = np.random.default_rng(seed).random(size)
+    if strata_col is None:
+        return np.flatnonzero(keys < n / size)
+    codes = category_codes(df, strata_col)[0] + 1
+    counts = np.bincount(codes)
+    quotas = np.minimum(np.maximum(np.round(counts * n / size), counts > 0), counts)
+    rates = np.divide(quotas, counts, out=np.zeros(len(counts)), where=counts > 0)
+    return np.flatnonzero(keys < rates[codes])
+
+@st.cache_resource(show_spinner="Tirage de l'échantillon...", max_entries=4)
+def _cached_sample(_df, version, n):
+    strata_col = strata_column(_df)
+    positions = stratified_positions(_df, n, strata_col)
+    return _df.iloc[positions], positions, strata_col
+
+def progressive_sample(df, n=PROGRESSIVE_SAMPLE_ROWS):
+    """(échantillon, positions dans df, colonne de stratification) en cache par version"""
+    return _cached_sample(df, dataset_version(df), n)
+
+def extrapolate_counts(stats, population_size, sample_size):
+    """Effectifs calculés sur l'échantillon ramenés au jeu complet (facteur N / n, allocation
+    proportionnelle). Les doublons ne s'extrapolent pas (paires de lignes) : inconnus (None)
+    jusqu'au calcul exact ; les pourcentages sont inchangés."""
+    factor = population_size / sample_size if sample_size else 1.0
+    scale = lambda values: (values * factor).round().astype("int64")
+    if stats["numeric"] is not None:
+        stats["numeric"] = stats["numeric"].assign(count=scale(stats["numeric"]["count"]))
+    stats["frequencies"] = {col: table.assign(**{"Fréquence absolue": scale(table["Fréquence absolue"])})
+                            for col, table in stats["frequencies"].items()}
+    stats["quality"] = stats["quality"].assign(**{"Valeurs manquantes": scale(stats["quality"]["Valeurs manquantes"]),
+                                                 "Doublons totaux": None})
+    stats["quality_metrics"]["duplicates"] = None
+    if stats["temporal"] is not None:
+        stats["temporal"]["mean_per_day"] *= factor
+    stats["kpi"]["rows"] = population_size
+    return stats
+
+# === Intervalles de confiance ===
+def mean_intervals(sample, numeric_cols, population_size, confidence=PROGRESSIVE_CONFIDENCE):
+    """IC de Student des moyennes (correction de population finie)"""
+    data = sample[numeric_cols]
+    n = data.count()
+    mean = data.mean()
+    fpc = np.sqrt(np.clip(1 - n / population_size, 0, 1))
+    margin = sps.t.ppf((1 + confidence) / 2, np.maximum(n - 1, 1)) * data.std() / np.sqrt(n) * fpc
+    return pd.DataFrame({
+        "Moyenne estimée": mean,
+        "IC bas": mean - margin,
+        "IC haut": mean + margin,
+        "n échantillon": n,
+    }).round(4)
+
+def correlation_interval(r, n, confidence=PROGRESSIVE_CONFIDENCE):
+    """IC d'un coefficient de Pearson par la transformation z de Fisher"""
+    if n <= 3 or np.isnan(r):
+        return np.nan, np.nan
+    z = np.arctanh(np.clip(r, -0.999999, 0.999999))
+    margin = sps.norm.ppf((1 + confidence) / 2) / np.sqrt(n - 3)
+    return np.tanh(z - margin), np.tanh(z + margin)
+
+def correlation_intervals(sample, numeric_cols, confidence=PROGRESSIVE_CONFIDENCE):
+    """IC de Fisher de chaque paire de colonnes (observations complètes par paire)"""
+    corr = sample[numeric_cols].corr()
+    valid = sample[numeric_cols].notna().to_numpy(dtype=float)
+    pair_n = valid.T @ valid
+    rows = []
+    for i, a in enumerate(numeric_cols):
+        for j in range(i + 1, len(numeric_cols)):
+            b = numeric_cols[j]
+            r = corr.loc[a, b]
+            low, high = correlation_interval(r, pair_n[i, j], confidence)
+            rows.append({"Variable 1": a, "Variable 2": b, "r estimé": r, "IC bas": low, "IC haut": high,
+                         "n échantillon": int(pair_n[i, j])})
+    return pd.DataFrame(rows).round(4)
@@ -0,0 +1,160 @@
+# core/scheduler.py
+# Ordonnanceur des calculs lourds (pairplot, Spearman, Machine Learning) : exécution dans un pool
+# de processus partagé par toutes les sessions, hors du thread du script Streamlit.
+# - dédoublonnage : une même clé de calcul en cours est partagée entre sessions ;
+# - annulation : une tâche remplacée (entrées modifiées) est annulée si personne d'autre ne l'attend ;
+# - limite de tâches actives par session ;
+# - l'interface interroge l'état de la tâche (fragment rafraîchi) au lieu de bloquer.
+# Les processus ne sont pas créés par fork (serveur multi-thread : verrous hérités dans un état
+# incohérent) : les fonctions soumises doivent être des fonctions de module importables.
+import multiprocessing
+import sys
+import threading
+import types
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from config.settings import (
+    SCHEDULER_MAX_WORKERS, SCHEDULER_MAX_TASKS_PER_SESSION, SCHEDULER_POLL_SECONDS, SCHEDULER_RESULT_ENTRIES,
+    SCHEDULER_START_METHOD
+)
+
+class SchedulerBusy(RuntimeError):
+    """Limite de tâches actives atteinte pour la session"""
+
+
+@contextmanager
+def _without_main_script():
+    """Streamlit installe le script de l'application comme module __main__ : un processus
+    démarré par spawn / forkserver le ré-exécuterait. Les processus de travail (créés à la
+    soumission d'une tâche) démarrent avec un module __main__ vide."""
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class ComputeScheduler:
+    def __init__(self, max_workers=SCHEDULER_MAX_WORKERS, max_tasks_per_session=SCHEDULER_MAX_TASKS_PER_SESSION,
+                 result_entries=SCHEDULER_RESULT_ENTRIES):
+        self.max_workers = max_workers
+        self.max_tasks_per_session = max_tasks_per_session
+        self.result_entries = result_entries
+        self._pool = None
+        self._lock = threading.Lock()
+        self._tasks = OrderedDict()  # clé -> Future (terminées conservées pour les reruns)
+        self._owners = {}  # clé -> sessions en attente du résultat
+        self._slots = {}  # (session, emplacement) -> clé demandée en dernier
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context(SCHEDULER_START_METHOD))
+        return self._pool
+
+    def _active(self, session_id):
+        return sum(1 for key, owners in self._owners.items()
+                   if session_id in owners and not self._tasks[key].done())
+
+    def _release(self, session_id, key):
+        owners = self._owners.get(key)
+        if owners is None:
+            return
+        owners.discard(session_id)
+        future = self._tasks[key]
+        # Une tâche déjà démarrée dans un processus ne peut pas être interrompue : son résultat
+        # reste en cache ; seules les tâches encore en file d'attente sont annulées
+        if not owners and not future.done() and future.cancel():
+            del self._tasks[key]
+            del self._owners[key]
+
+    def _evict(self):
+        done = [key for key, future in self._tasks.items() if future.done()]
+        for key in done[:max(len(self._tasks) - self.result_entries, 0)]:
+            del self._tasks[key]
+            self._owners.pop(key, None)
+
+    def submit(self, session_id, slot, key, fn, *args):
+        """Soumet fn(*args) pour l'emplacement `slot` de la session et retourne le Future.
+
+        `key` identifie le calcul (entrées comprises) : une clé identique réutilise la tâche
+        en cours ou son résultat ; une nouvelle clé sur le même emplacement remplace l'ancienne.
+        """
+        with self._lock:
+            previous = self._slots.get((session_id, slot))
+            if previous is not None and previous != key:
+                self._release(session_id, previous)
+
+            future = self._tasks.get(key)
+            if future is None:
+                if self._active(session_id) >= self.max_tasks_per_session:
+                    self._slots.pop((session_id, slot), None)
+                    raise SchedulerBusy(f"{self.max_tasks_per_session} calculs déjà en cours pour cette session")
+                with _without_main_script():
+                    try:
+                        future = self._executor().submit(fn, *args)
+                    except BrokenProcessPool:
+                        # Processus de travail tombé (mémoire insuffisante...) : nouveau pool
+                        self._pool = None
+                        future = self._executor().submit(fn, *args)
+                self._tasks[key] = future
+                self._evict()
+            else:
+                self._tasks.move_to_end(key)
+
+            self._owners.setdefault(key, set()).add(session_id)
+            self._slots[(session_id, slot)] = key
+            return future
+
+    def cancel(self, session_id, slot):
+        """Abandonne la tâche de l'emplacement (annulée si aucune autre session ne l'attend)"""
+        with self._lock:
+            key = self._slots.pop((session_id, slot), None)
+            if key is not None:
+                self._release(session_id, key)
+
+
+@st.cache_resource(show_spinner=False)
+def get_scheduler():
+    """Ordonnanceur unique du serveur (partagé par toutes les sessions)"""
+    return ComputeScheduler()
+
+def _session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+def run_in_background(slot, key, fn, *args, label="Calcul"):
+    """Résultat de fn(*args) s'il est disponible, sinon None avec un indicateur d'attente.
+
+    L'indicateur est un fragment rafraîchi toutes les SCHEDULER_POLL_SECONDS secondes qui
+    relance la page dès que la tâche est terminée. Les erreurs du calcul sont propagées.
+    """
+    session_id = _session_id()
+    try:
+        future = get_scheduler().submit(session_id, slot, key, fn, *args)
+    except SchedulerBusy as e:
+        st.warning(f"⏳ {label} mis en attente : {e}. Réessayez dans un instant.")
+        return None
+
+    if future.done():
+        return future.result()
+
+    @st.fragment(run_every=SCHEDULER_POLL_SECONDS)
+    def poll():
+        if future.done():
+            st.rerun()
+        st.info(f"⏳ {label} en cours en arrière-plan... Les autres sections restent utilisables.")
+
+    poll()
+    return None
+
+def cancel_background(slot):
+    """Abandonne le calcul de l'emplacement pour la session courante"""
+    get_scheduler().cancel(_session_id(), slot)
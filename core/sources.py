@@ -0,0 +1,186 @@
+# core/sources.py
+# Sources de données locales interrogées sur place : base SQLite (sqlite3) ou fichier / dossier
+# Parquet (DuckDB embarqué). Un SqlFrame décrit une requête (table, colonnes projetées, filtres)
+# sans rien charger : les filtres de l'analyse, la projection et les agrégats du tableau de bord
+# sont traduits en SQL par le moteur « sql » (core.backend.SqlBackend) ; seuls les résultats
+# agrégés et les échantillons sont ramenés en pandas.
+import hashlib
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from config.settings import SQL_SCHEMA_ROWS
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+def quote_name(name):
+    """Identifiant SQL entre guillemets (colonnes et tables aux noms libres)"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _param(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+def source_engine(location):
+    """« sqlite » pour une base SQLite, « duckdb » pour un fichier ou dossier Parquet"""
+    path = Path(location)
+    if path.is_dir() or path.suffix.lower() == '.parquet':
+        if not DUCKDB_AVAILABLE:
+            raise ValueError("Lecture Parquet par requêtes : installez le paquet duckdb")
+        return "duckdb"
+    if path.suffix.lower() in SQLITE_EXTENSIONS:
+        return "sqlite"
+    raise ValueError(f"Source non supportée : {path.name} (base SQLite, fichier ou dossier Parquet)")
+
+def execute(engine, location, sql, params=()):
+    """Exécute une requête en lecture seule ; résultat en DataFrame pandas"""
+    params = [_param(value) for value in params]
+    if engine == "sqlite":
+        with closing(sqlite3.connect(f"file:{quote(str(Path(location).resolve()))}?mode=ro", uri=True)) as con:
+            return pd.read_sql_query(sql, con, params=params)
+    con = duckdb.connect()
+    try:
+        return con.execute(sql, params).df()
+    finally:
+        con.close()
+
+def list_tables(location):
+    """Tables interrogeables de la source (une seule pour du Parquet)"""
+    if source_engine(location) == "duckdb":
+        return [Path(location).name]
+    tables = execute("sqlite", location,
+                     "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+                     "AND name NOT LIKE 'sqlite_%' ORDER BY name")
+    return tables["name"].tolist()
+
+def _relation(engine, location, table):
+    if engine == "sqlite":
+        return quote_name(table)
+    path = Path(location)
+    pattern = str(path / "**" / "*.parquet") if path.is_dir() else str(path)
+    return f"read_parquet('{pattern.replace(chr(39), chr(39) * 2)}', union_by_name = true)"
+
+def _fingerprint(location):
+    """Empreinte des fichiers de la source (taille, date de modification)"""
+    path = Path(location)
+    files = sorted(path.rglob("*.parquet")) if path.is_dir() else [path]
+    return [(str(f), f.stat().st_size, f.stat().st_mtime_ns) for f in files]
+
+def _sqlite_date_columns(location, table):
+    """Colonnes déclarées DATE / DATETIME / TIMESTAMP (stockées en texte par SQLite)"""
+    info = execute("sqlite", location, f"PRAGMA table_info({quote_name(table)})")
+    return [row["name"] for _, row in info.iterrows()
+            if "DATE" in str(row["type"]).upper() or "TIME" in str(row["type"]).upper()]
+
+
+class SqlFrame:
+    """Table d'une source locale vue comme un DataFrame paresseux : projection de colonnes
+    (`frame[colonnes]`) et filtres (`frame[filtres]`, spécification de core.backend) produisent
+    une nouvelle requête ; les données ne sont lues que par le moteur SqlBackend."""
+
+    def __init__(self, location, table=None):
+        self.location = str(location)
+        self.engine = source_engine(location)
+        self.table = table or list_tables(location)[0]
+        self.relation = _relation(self.engine, self.location, self.table)
+        self.date_cols = _sqlite_date_columns(self.location, self.table) if self.engine == "sqlite" else []
+        self.filters = ()
+        self._schema = self.query("*", extra=f"LIMIT {SQL_SCHEMA_ROWS}").iloc[:0]
+        self.columns = self._schema.columns
+        self._base_token = hashlib.sha1(f"{self.engine}{self.table}{_fingerprint(self.location)}".encode()).hexdigest()
+        self.source_token = self._token()
+
+    def _token(self):
+        return hashlib.sha1(f"{self._base_token}{list(self.columns)}{self.filters!r}".encode()).hexdigest()[:16]
+
+    def _derive(self, columns=None, filters=None):
+        """Nouvelle requête (même source et schéma) ; aucune donnée lue"""
+        new = object.__new__(SqlFrame)
+        new.__dict__.update(self.__dict__)
+        if columns is not None:
+            new.columns = pd.Index(columns)
+        if filters is not None:
+            new.filters = tuple(filters)
+        new.source_token = new._token()
+        return new
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):  # Filtres (SqlBackend.filter_mask)
+            return self._derive(filters=self.filters + key)
+        if isinstance(key, str):
+            key = [key]
+        return self._derive(columns=list(key))
+
+    def __repr__(self):
+        return f"SqlFrame({self.engine}: {self.table}, {len(self.columns)} colonnes, {len(self.filters)} filtres)"
+
+    @property
+    def dtypes(self):
+        return self._schema[list(self.columns)].dtypes
+
+    def select_dtypes(self, include=None, exclude=None):
+        """Schéma vide des colonnes des types demandés (types lus sur les premières lignes)"""
+        return self._schema[list(self.columns)].select_dtypes(include=include, exclude=exclude)
+
+    # === Génération SQL ===
+    def where(self, filters=None):
+        """Clause WHERE et paramètres des filtres du cadre (plus `filters`)"""
+        clauses, params = [], []
+        for f in self.filters + tuple(filters or ()):
+            if f["op"] == "not_null":
+                clauses.append(f"{quote_name(f['col'])} IS NOT NULL")
+            elif f["op"] == "between":
+                clauses.append(f"{quote_name(f['col'])} BETWEEN ? AND ?")
+                params.extend(f["value"])
+            else:
+                selected = (f"{quote_name(f['col'])} IN ({', '.join('?' * len(f['value']))})"
+                            if f["value"] else "1 = 0")
+                if f.get("missing"):
+                    selected = f"({selected} OR {quote_name(f['col'])} IS NULL)"
+                clauses.append(selected)
+                params.extend(f["value"])
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, select, extra="", filters=None):
+        """SELECT `select` FROM la table (filtres appliqués) ; résultat pandas"""
+        clause, params = self.where(filters)
+        result = execute(self.engine, self.location, f"SELECT {select} FROM {self.relation} {clause} {extra}", params)
+        return self._convert(result)
+
+    def _convert(self, result):
+        for col in self.date_cols:
+            if col in result.columns:
+                result[col] = pd.to_datetime(result[col], errors="coerce")
+        return result
+
+    def day_expr(self, col):
+        """Expression SQL de la date (jour) d'une colonne temporelle"""
+        if self.engine == "sqlite":
+            return f"date({quote_name(col)})"
+        return f"CAST({quote_name(col)} AS DATE)"
+
+    def sample_sql(self, n):
+        """Requête d'un échantillon aléatoire d'au plus n lignes (colonnes projetées, filtres appliqués)"""
+        select = ", ".join(quote_name(col) for col in self.columns)
+        clause, params = self.where()
+        if self.engine == "sqlite":
+            return f"SELECT {select} FROM {self.relation} {clause} ORDER BY random() LIMIT {int(n)}", params
+        return (f"SELECT * FROM (SELECT {select} FROM {self.relation} {clause}) "
+                f"USING SAMPLE reservoir({int(n)} ROWS) REPEATABLE (0)"), params
+
+
+def open_source(location, table=None):
+    """Ouvre une base SQLite ou un fichier / dossier Parquet local (ValueError si invalide)"""
+    if not os.path.exists(location):
+        raise ValueError(f"Chemin introuvable : {location}")
+    return SqlFrame(location, table)
@@ -0,0 +1,142 @@
+# core/stats.py
+# Calculs statistiques du tableau de bord, sans éléments d'interface (partagés entre l'interface,
+# les exports et le traitement par lots). Les fréquences et agrégats temporels passent par les
+# caches de core.frequency et core.timeseries (st.cache_*) : Streamlit doit être installé, mais
+# hors d'une application ces caches fonctionnent sans session (simple mémoïsation).
+import pandas as pd
+import numpy as np
+from core.frequency import frequency_table
+from core.timeseries import get_rollups
+
+PERCENTILES = [.05, .1, .25, .5, .75, .9, .95]
+FREQ_TOP_N = 20
+# Colonnes du résumé numérique, dans l'ordre d'affichage (tous moteurs)
+SUMMARY_COLUMNS = ["count", "mean", "std", "min"] + [f"{q * 100:g}%" for q in PERCENTILES] + \
+    ["max", "mode", "skewness", "kurtosis", "variance", "cv (%)", "Gini"]
+
+
+# === Fonction pour calculer l'indice de Gini ===
+def gini_coefficient(x):
+    """Calcule l'indice de Gini pour une série de valeurs numériques (valeurs absolues si négatives)"""
+    x = np.array(x.dropna())
+    if len(x) == 0:
+        return np.nan
+    x = np.sort(np.abs(x))
+    n = len(x)
+    cumx = np.cumsum(x)
+    if cumx[-1] == 0:
+        return np.nan
+    gini = (2 * np.sum((np.arange(1, n+1) * x)) / (n * cumx[-1])) - (n + 1) / n
+    return round(gini, 4)
+
+def finish_summary(desc):
+    """Mise en forme commune des résumés numériques : coefficient de variation, ordre des colonnes, arrondi"""
+    desc['cv (%)'] = (desc['std'] / desc['mean'] * 100).round(2)
+    return desc[SUMMARY_COLUMNS].round(3)
+
+def numeric_summary(df, numeric_cols):
+    """Statistiques descriptives numériques (percentiles, moments, Gini)"""
+    desc = df[numeric_cols].describe(percentiles=PERCENTILES).T
+    desc['mode'] = df[numeric_cols].mode().iloc[0]
+    desc['skewness'] = df[numeric_cols].skew()
+    desc['kurtosis'] = df[numeric_cols].kurtosis()
+    desc['variance'] = df[numeric_cols].var()
+    desc['Gini'] = [gini_coefficient(df[col]) for col in numeric_cols]
+    return finish_summary(desc)
+
+def frequency_tables(df, categorical_cols, top_n=FREQ_TOP_N):
+    """Tables de fréquences absolues et relatives par colonne catégorielle (top N + « Autres »)"""
+    return {col: frequency_table(df, col, top_n=top_n) for col in categorical_cols}
+
+def quality_table(columns, missing, n_rows, duplicates):
+    """Table qualité par colonne + indicateurs globaux depuis les comptages (tous moteurs)"""
+    missing = pd.Series(np.asarray(missing), index=columns)
+    missing_pct = (missing / n_rows) * 100 if n_rows else missing * 0.0
+    table = pd.DataFrame({
+        "Colonne": columns,
+        "Valeurs manquantes": missing.values,
+        "Taux manquant (%)": missing_pct.round(2).values,
+        "Doublons totaux": [duplicates] * len(columns)
+    })
+    metrics = {
+        "missing_pct": missing_pct.mean(),
+        "duplicates": duplicates,
+        "completeness": (1 - missing_pct.mean() / 100) * 100,
+    }
+    return table, metrics
+
+def quality_summary(df):
+    """Valeurs manquantes et doublons : table par colonne + indicateurs globaux"""
+    return quality_table(df.columns, df.isna().sum(), len(df), int(df.duplicated().sum()))
+
+def correlations(df, numeric_cols):
+    """Matrices de corrélation de Pearson et de Spearman"""
+    return {
+        "pearson": df[numeric_cols].corr(method='pearson'),
+        "spearman": df[numeric_cols].corr(method='spearman'),
+    }
+
+def spearman_correlation(numeric_df):
+    """Matrice de Spearman (rangs) – exécutable dans un processus de travail"""
+    return numeric_df.corr(method='spearman')
+
+def describe_all(df):
+    """Résumé de toutes les colonnes (fonction de module : exécutable en arrière-plan)"""
+    return df.describe(include='all')
+
+def temporal_summary(df, date_col):
+    """Durée couverte, dates uniques et rythme d'une colonne date (depuis les rollups en cache)"""
+    rollups = get_rollups(df, date_col)
+    if rollups is None:
+        return None
+    days = rollups["levels"]["jour"]
+    months = rollups["levels"]["mois"]
+    return {
+        "date_col": date_col,
+        "duration_days": (rollups["end"] - rollups["start"]).days,
+        "unique_dates": len(days),
+        "mean_per_day": days["count"].mean(),
+        "busiest_month": months["count"].idxmax().strftime("%m/%Y"),
+    }
+
+def kpi_summary(df):
+    """Indicateurs clés globaux"""
+    return {
+        "rows": len(df),
+        "columns": len(df.columns),
+        "completeness": (1 - df.isna().mean().mean()) * 100,
+        "density": (df.notna().sum().sum() / (len(df) * len(df.columns))) * 100,
+    }
+
+def compute_dashboard_stats(df, backend=None, correlation_methods=("pearson", "spearman")):
+    """Calcule l'ensemble des statistiques du tableau de bord en un dictionnaire.
+
+    `backend` : moteur de calcul (core.backend), celui de la configuration par défaut.
+    `correlation_methods` : matrices calculées (l'interface calcule Spearman en arrière-plan).
+    """
+    from core.backend import get_backend  # Import local : core.backend dépend de ce module
+    backend = backend or get_backend(df)
+
+    numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    date_cols = df.select_dtypes(include='datetime').columns.tolist()
+
+    numeric = backend.numeric_summary(df, numeric_cols) if numeric_cols else None
+    # Minimums exacts : un minimum négatif proche de zéro s'arrondit à 0 dans le résumé
+    minimums = backend.numeric_bounds(df, numeric_cols)[0] if numeric_cols else pd.Series(dtype=float)
+    quality, quality_metrics = backend.quality_summary(df)
+    return {
+        "backend": backend.name,
+        "approximate": backend.approximate,
+        "numeric_cols": numeric_cols,
+        "categorical_cols": categorical_cols,
+        "date_cols": date_cols,
+        "numeric": numeric,
+        "has_negative": minimums.index[minimums < 0].tolist(),
+        "frequencies": {col: backend.frequency_table(df, col, top_n=FREQ_TOP_N) for col in categorical_cols},
+        "quality": quality,
+        "quality_metrics": quality_metrics,
+        "correlations": backend.correlations(df, numeric_cols, correlation_methods) if len(numeric_cols) >= 2 else None,
+        "temporal": backend.temporal_summary(df, date_cols[0]) if date_cols else None,
+        "kpi": backend.kpi_summary(df),
+    }
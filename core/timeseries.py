@@ -0,0 +1,104 @@
+# core/timeseries.py
+# Agrégations temporelles multi-résolution (rollups) : min / moyenne / max / effectif par
+# minute, heure, jour, semaine et mois, calculées une seule fois par version du jeu de données.
+# Le graphique choisit la granularité selon la plage visible et le budget de points.
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.settings import TS_MAX_POINTS, TS_CACHE_ENTRIES
+from core.cache import dataset_version
+
+RAW_LEVEL = "brut"
+# (nom, unité numpy, niveau source) de la plus fine à la plus grossière ; les semaines
+# chevauchant deux mois, le mois est agrégé à partir des jours
+LEVELS = [("minute", "m", RAW_LEVEL), ("heure", "h", "minute"), ("jour", "D", "heure"),
+          ("semaine", "W", "jour"), ("mois", "M", "jour")]
+
+def _bucket(times, unit):
+    """Début de période de chaque horodatage (tableau datetime64 trié)"""
+    if unit == "W":
+        # Les semaines numpy commencent le jeudi (1970-01-01) : décalage pour des semaines ISO (lundi)
+        shift = np.timedelta64(3, "D")
+        return ((times + shift).astype("datetime64[W]").astype("datetime64[D]") - shift).astype(times.dtype)
+    return times.astype(f"datetime64[{unit}]").astype(times.dtype)
+
+def _reduce(keys, mins, maxs, sums, counts):
+    """Agrège des blocs consécutifs de même clé (données triées) en une passe vectorisée"""
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.array([], dtype=int)
+    if not len(starts):
+        return keys, mins, maxs, sums, counts
+    return (keys[starts], np.minimum.reduceat(mins, starts), np.maximum.reduceat(maxs, starts),
+            np.add.reduceat(sums, starts), np.add.reduceat(counts, starts))
+
+def build_rollups(df, time_col, value_col=None):
+    """Construit toutes les granularités pour (time_col, value_col).
+
+    Sans value_col, seuls les effectifs par période sont calculés.
+    Retourne None si la colonne temporelle ne contient aucune date.
+    """
+    cols = [time_col] if value_col in (None, time_col) else [time_col, value_col]
+    data = df[cols].dropna()
+    if data.empty:
+        return None
+
+    times = data[time_col]
+    if times.dt.tz is not None:
+        times = times.dt.tz_localize(None)
+    times = times.to_numpy()
+    order = np.argsort(times, kind="stable")
+    times = times[order]
+    values = data[value_col].to_numpy(dtype=float)[order] if len(cols) == 2 else None
+
+    index = pd.DatetimeIndex(times, name=time_col)
+    levels = {RAW_LEVEL: pd.DataFrame({"valeur": values} if values is not None else {}, index=index)}
+
+    zeros = np.zeros(len(times))
+    arrays = {RAW_LEVEL: (times, *([values] * 3 if values is not None else [zeros] * 3),
+                          np.ones(len(times), dtype=np.int64))}
+    for name, unit, parent in LEVELS:
+        parent_keys, *aggregates = arrays[parent]
+        keys, mins, maxs, sums, counts = _reduce(_bucket(parent_keys, unit), *aggregates)
+        arrays[name] = keys, mins, maxs, sums, counts
+        level = pd.DataFrame({"count": counts}, index=pd.DatetimeIndex(keys, name=time_col))
+        if values is not None:
+            level["min"], level["mean"], level["max"] = mins, sums / counts, maxs
+            level["sum"] = sums
+        levels[name] = level
+
+    return {
+        "time_col": time_col,
+        "value_col": value_col if len(cols) == 2 else None,
+        "start": index[0],
+        "end": index[-1],
+        "levels": levels,
+    }
+
+def _slice(level, start, end, aggregated):
+    index = level.index
+    i0 = 0
+    if start is not None:
+        # Une période agrégée est incluse dès qu'elle chevauche la plage visible
+        i0 = max(index.searchsorted(start, side="right") - 1, 0) if aggregated else index.searchsorted(start)
+    i1 = len(index) if end is None else index.searchsorted(end, side="right")
+    return level.iloc[i0:i1]
+
+def select_rollup(rollups, start=None, end=None, max_points=TS_MAX_POINTS):
+    """Granularité la plus fine dont le nombre de points sur [start, end] tient dans le budget.
+
+    Retourne (nom du niveau, DataFrame restreint à la plage).
+    """
+    names = [RAW_LEVEL] + [name for name, _, _ in LEVELS]
+    for name in names:
+        data = _slice(rollups["levels"][name], start, end, aggregated=name != RAW_LEVEL)
+        if len(data) <= max_points:
+            return name, data
+    return names[-1], data
+
+@st.cache_resource(show_spinner="Calcul des agrégations temporelles...", max_entries=TS_CACHE_ENTRIES)
+def _cached_rollups(_df, version, time_col, value_col):
+    return build_rollups(_df, time_col, value_col)
+
+def get_rollups(df, time_col, value_col=None):
+    """Rollups mis en cache par (version du jeu de données, colonnes) – ne pas modifier le résultat"""
+    return _cached_rollups(df, dataset_version(df), time_col, value_col)
@@ -0,0 +1,164 @@
+# core/type_inference.py
+# Détection automatique des types au chargement : dates et nombres stockés en texte.
+# Le format est deviné une seule fois sur un échantillon, puis la colonne entière est
+# convertie en un seul appel vectorisé (pas de repli élément par élément).
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow est fourni avec Streamlit, repli pandas sinon
+    pa = None
+
+from config.settings import TYPE_INFERENCE_SAMPLE_SIZE, TYPE_INFERENCE_THRESHOLD
+
+# Formats testés dans l'ordre : formats français avant américains en cas d'égalité
+DATE_FORMATS = [
+    "ISO8601",
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+]
+
+# Séparateurs de milliers : espaces, y compris insécables (\s couvre \u00a0 et \u202f)
+_SPACES = r"\s"
+# Virgule décimale : les points éventuels sont strictement des séparateurs de milliers
+# (« 1.234,5 ») ; « 1,234.5 » ou « 2.5 » ne sont pas lus à la française
+_COMMA_NUMBER = r"[+-]?(\d{1,3}(\.\d{3})+|\d+)(,\d+)?"
+# Codes complétés par des zéros (« 01234 ») : conservés en texte
+_LEADING_ZERO = r"[+-]?0\d"
+
+def _is_text(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+def _strip(series):
+    return series.astype(str).str.strip().where(series.notna())
+
+def _sample(series, size):
+    values = series.dropna()
+    if len(values) > size:
+        values = values.sample(size, random_state=0)
+    return _strip(values)
+
+def _to_number(values, decimal_comma):
+    """Conversion numérique ; NaN pour les valeurs non conformes au mode ou à zéros de tête"""
+    values = values.str.replace(_SPACES, "", regex=True)
+    invalid = values.str.match(_LEADING_ZERO).fillna(False).astype(bool)
+    if decimal_comma:
+        invalid |= ~values.str.fullmatch(_COMMA_NUMBER).fillna(True).astype(bool)
+        values = values.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    return pd.to_numeric(values.mask(invalid), errors="coerce")
+
+def guess_numeric(sample, threshold=TYPE_INFERENCE_THRESHOLD):
+    """Retourne 'point' ou 'comma' (séparateur décimal) si l'échantillon est numérique, sinon None"""
+    if sample.empty:
+        return None
+    for mode in ("point", "comma"):
+        if _to_number(sample, mode == "comma").notna().mean() >= threshold:
+            return mode
+    return None
+
+def guess_date_format(sample, threshold=TYPE_INFERENCE_THRESHOLD):
+    """Format de date le mieux reconnu sur l'échantillon, ou None"""
+    if sample.empty:
+        return None
+    best_format, best_ratio = None, 0.0
+    for fmt in DATE_FORMATS:
+        ratio = pd.to_datetime(sample, format=fmt, errors="coerce").notna().mean()
+        if ratio > best_ratio:
+            best_format, best_ratio = fmt, ratio
+        if ratio == 1.0:
+            break
+    return best_format if best_ratio >= threshold else None
+
+def _to_datetime(values, fmt):
+    """Conversion vectorisée ; strptime d'Arrow pour les formats explicites (pandas n'accélère que l'ISO 8601)"""
+    if pa is None or fmt == "ISO8601":
+        return pd.to_datetime(values, format=fmt, errors="coerce")
+    parsed = pc.strptime(pa.array(values.to_numpy(dtype=object), type=pa.string(), from_pandas=True),
+                         format=fmt, unit="us", error_is_null=True)
+    return pd.Series(parsed.to_numpy(zero_copy_only=False), index=values.index, name=values.name)
+
+def _accept(original, converted):
+    """La conversion ne doit perdre aucune valeur renseignée (texte vide compris comme manquant)"""
+    present = _strip(original).fillna("").ne("")
+    return bool(converted[present].notna().all())
+
+def infer_column(series, sample_size=TYPE_INFERENCE_SAMPLE_SIZE, threshold=TYPE_INFERENCE_THRESHOLD):
+    """Convertit une colonne texte en numérique ou en date si l'échantillon le justifie"""
+    if not _is_text(series):
+        return series
+    sample = _sample(series, sample_size)
+
+    mode = guess_numeric(sample, threshold)
+    if mode is not None:
+        converted = _to_number(_strip(series), mode == "comma")
+        if _accept(series, converted):
+            return converted
+
+    fmt = guess_date_format(sample, threshold)
+    if fmt is not None:
+        converted = _to_datetime(_strip(series), fmt)
+        if _accept(series, converted):
+            return converted
+
+    return series
+
+def infer_types(df, sample_size=TYPE_INFERENCE_SAMPLE_SIZE, threshold=TYPE_INFERENCE_THRESHOLD):
+    """Applique la détection à toutes les colonnes texte et retourne le DataFrame converti"""
+    result = df
+    for col in df.columns:
+        series = df[col]
+        converted = infer_column(series, sample_size, threshold)
+        if converted is not series:
+            if result is df:
+                result = df.copy(deep=False)
+            result[col] = converted
+    return result
+
+# === Plan de conversion (données partitionnées : format deviné sur un échantillon) ===
+def infer_plan(sample_df, threshold=TYPE_INFERENCE_THRESHOLD):
+    """{colonne: ("numeric", "point"|"comma") ou ("date", format)} deviné sur un échantillon"""
+    plan = {}
+    for col in sample_df.columns:
+        series = sample_df[col]
+        if not _is_text(series):
+            continue
+        sample = _strip(series.dropna())
+        # L'échantillon doit être converti sans perte (colonne complète contrôlée par plan_losses)
+        mode = guess_numeric(sample, threshold)
+        if mode is not None and _accept(sample, _to_number(sample, mode == "comma")):
+            plan[col] = ("numeric", mode)
+            continue
+        fmt = guess_date_format(sample, threshold)
+        if fmt is not None and _accept(sample, _to_datetime(sample, fmt)):
+            plan[col] = ("date", fmt)
+    return plan
+
+def _convert(values, kind, arg):
+    return _to_number(values, arg == "comma") if kind == "numeric" else _to_datetime(values, arg)
+
+def apply_plan(df, plan):
+    """Applique un plan de conversion (par partition ; plan vérifié au préalable par plan_losses)"""
+    if not plan:
+        return df
+    df = df.copy(deep=False)
+    for col, (kind, arg) in plan.items():
+        df[col] = _convert(_strip(df[col]), kind, arg)
+    return df
+
+def plan_losses(df, plan):
+    """Valeurs renseignées que le plan rendrait manquantes, par colonne (une ligne par partition)"""
+    losses = {}
+    for col, (kind, arg) in plan.items():
+        values = _strip(df[col])
+        present = values.fillna("").ne("")
+        losses[col] = [int((present & _convert(values, kind, arg).isna()).sum())]
+    return pd.DataFrame(losses, dtype="int64")
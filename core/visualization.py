@@ -7,6 +7,14 @@ from plotly.subplots import make_subplots
 import numpy as np
 import scipy.stats as stats
 import pandas as pd
+from datetime import timedelta
+from config.settings import TS_MARKERS_MAX_POINTS, FREQ_PIE_TOP_N
+from core.associations import associations
+from core.backend import get_backend
+from core.cache import dataset_version
+from core.scheduler import run_in_background
+from core.frequency import value_counts
+from core.timeseries import get_rollups, select_rollup, RAW_LEVEL
 
 # === Layout dynamique clair/sombre ===
 def get_layout(dark_mode: bool = False):
@@ -85,10 +93,10 @@ def plot_density(df, column, dark_mode=False):
     fig.update_layout(title=title, height=500, **get_layout(dark_mode))
     st.plotly_chart(fig, use_container_width=True, key=get_unique_key(f"density_{column}"))
 
-def plot_bar(df, column, top_n=15, dark_mode=False):
+def plot_bar(df, column, top_n=15, dark_mode=False, counts=None):
     if column not in df.columns:
         return
-    counts = df[column].value_counts().head(top_n)
+    counts = (counts if counts is not None else value_counts(df, column)).head(top_n)
     title = f"Top {top_n} de {column}"
     fig = px.bar(x=counts.index, y=counts.values, title=title,
                  labels={'x': column, 'y': 'Fréquence'},
@@ -96,19 +104,21 @@ def plot_bar(df, column, top_n=15, dark_mode=False):
     fig.update_layout(height=600, **get_layout(dark_mode))
     st.plotly_chart(fig, use_container_width=True, key=get_unique_key(f"bar_{column}"))
 
-def plot_pie(df, column, dark_mode=False):
+def plot_pie(df, column, dark_mode=False, counts=None):
     if column not in df.columns:
         return
-    counts = df[column].value_counts()
+    if counts is None:
+        counts = value_counts(df, column, top_n=FREQ_PIE_TOP_N, other=True)
     title = f"Répartition de {column}"
     fig = px.pie(counts, values=counts.values, names=counts.index, title=title)
     fig.update_layout(**get_layout(dark_mode))
     st.plotly_chart(fig, use_container_width=True, key=get_unique_key(f"pie_{column}"))
 
-def plot_donut(df, column, dark_mode=False):
+def plot_donut(df, column, dark_mode=False, counts=None):
     if column not in df.columns:
         return
-    counts = df[column].value_counts()
+    if counts is None:
+        counts = value_counts(df, column, top_n=FREQ_PIE_TOP_N, other=True)
     title = f"Répartition de {column}"
     fig = px.pie(counts, values=counts.values, names=counts.index, hole=0.4, title=title)
     fig.update_traces(textposition='inside', textinfo='percent+label')
@@ -173,11 +183,11 @@ def plot_scatter(df, x_col, y_col, color_col=None, size_col=None, dark_mode=Fals
 
 # === Graphiques multivariés ===
 def plot_correlation_heatmap(df, dark_mode=False):
-    numeric_df = df.select_dtypes(include='number')
-    if len(numeric_df.columns) < 2:
+    numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    if len(numeric_cols) < 2:
         st.info("Pas assez de colonnes numériques pour la corrélation.")
         return
-    corr = numeric_df.corr()
+    corr = get_backend().correlations(df, numeric_cols, methods=("pearson",))["pearson"]
     fig = px.imshow(
         corr,
         text_auto=".2f",
@@ -189,11 +199,28 @@ def plot_correlation_heatmap(df, dark_mode=False):
     fig.update_layout(**get_layout(dark_mode))
     st.plotly_chart(fig, use_container_width=True, key=get_unique_key("corr_heatmap"))
 
-def plot_pairplot(df, dark_mode=False):
-    numeric_df = df.select_dtypes(include='number')
-    if len(numeric_df.columns) < 2:
-        st.info("Pas assez de colonnes numériques.")
+def plot_association_heatmap(df, dark_mode=False):
+    """Associations entre variables de tous types (V de Cramér, rapport de corrélation, Pearson)"""
+    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    if not categorical_cols or len(df.columns) < 2:
+        st.info("Au moins une colonne catégorielle nécessaire pour la matrice d'association.")
         return
+    matrix = associations(df)
+    fig = px.imshow(
+        matrix,
+        text_auto=".2f",
+        aspect="auto",
+        color_continuous_scale='RdBu_r',
+        zmin=-1,
+        zmax=1,
+        title="Matrice d'association (V de Cramér, rapport de corrélation η, Pearson)",
+        height=600
+    )
+    fig.update_layout(**get_layout(dark_mode))
+    st.plotly_chart(fig, use_container_width=True, key=get_unique_key("assoc_heatmap"))
+
+def pairplot_figure(numeric_df, dark_mode=False):
+    """Figure du pairplot (construite dans un processus de travail de l'ordonnanceur)"""
     fig = px.scatter_matrix(
         numeric_df,
         dimensions=numeric_df.columns,
@@ -202,7 +229,18 @@ def plot_pairplot(df, dark_mode=False):
         height=800
     )
     fig.update_layout(**get_layout(dark_mode))
-    st.plotly_chart(fig, use_container_width=True, key=get_unique_key("pairplot"))
+    return fig
+
+def plot_pairplot(df, dark_mode=False):
+    numeric_df = df.select_dtypes(include='number')
+    if len(numeric_df.columns) < 2:
+        st.info("Pas assez de colonnes numériques.")
+        return
+    # Calcul en arrière-plan : un changement de filtre remplace la tâche en cours
+    fig = run_in_background("pairplot", (dataset_version(numeric_df), "pairplot", dark_mode),
+                            pairplot_figure, numeric_df, dark_mode, label="Génération du pairplot")
+    if fig is not None:
+        st.plotly_chart(fig, use_container_width=True, key=get_unique_key("pairplot"))
 
 # === Fonctions ajoutées pour l'onglet Multivariée ===
 def plot_parallel_coordinates(df, dark_mode=False):
@@ -263,13 +301,26 @@ def plot_waterfall_chart(values, labels, dark_mode=False):
     st.plotly_chart(fig, use_container_width=True, key=get_unique_key("waterfall_chart"))
 
 
-def plot_line_evolution(df, x_col, y_col, dark_mode=False):
+def plot_line_evolution(df, x_col, y_col, dark_mode=False, band=None):
+    """Courbe(s) de y_col (colonne ou liste de colonnes) selon x_col.
+
+    `band` : (colonne basse, colonne haute, libellé) tracées en zone remplie, par exemple
+    l'intervalle de prédiction d'une prévision (core.forecasting).
+    """
+    if band is not None:
+        _plot_band_evolution(df, x_col, list(np.atleast_1d(y_col)), band, dark_mode)
+        return
+
     # Vérifications de sécurité
     if x_col not in df.columns or y_col not in df.columns:
         st.warning("Colonnes sélectionnées invalides.")
         return
 
-    data = df[[x_col, y_col]].dropna()
+    if pd.api.types.is_datetime64_any_dtype(df[x_col]) and pd.api.types.is_numeric_dtype(df[y_col]):
+        plot_time_rollup(df, x_col, y_col, dark_mode=dark_mode)
+        return
+
+    data = df[list(dict.fromkeys([x_col, y_col]))].dropna().sort_values(x_col)  # x_col == y_col possible
 
     if data.empty:
         st.info("Aucune donnée disponible pour l’évolution temporelle.")
@@ -281,7 +332,7 @@ def plot_line_evolution(df, x_col, y_col, dark_mode=False):
         data,
         x=x_col,
         y=y_col,
-        markers=True,
+        markers=len(data) <= TS_MARKERS_MAX_POINTS,
         title=f"Évolution de {y_col} en fonction de {x_col}",
         template=template
     )
@@ -294,6 +345,86 @@ def plot_line_evolution(df, x_col, y_col, dark_mode=False):
 
     st.plotly_chart(fig, use_container_width=True)
 
+def _plot_band_evolution(df, x_col, y_cols, band, dark_mode=False):
+    """Courbes y_cols et zone band = (basse, haute, libellé), données déjà ordonnées selon x_col"""
+    low, high, label = band
+    if any(col not in df.columns for col in [x_col, low, high] + y_cols):
+        st.warning("Colonnes sélectionnées invalides.")
+        return
+
+    data = df.sort_values(x_col)
+    bounds = data.dropna(subset=[low, high])
+    fig = go.Figure([
+        go.Scatter(x=bounds[x_col], y=bounds[high], name=high, mode="lines",
+                   line=dict(width=0), showlegend=False),
+        go.Scatter(x=bounds[x_col], y=bounds[low], name=label, mode="lines",
+                   line=dict(width=0), fill="tonexty", fillcolor="rgba(99, 110, 250, 0.2)"),
+    ])
+    for col in y_cols:
+        line = data.dropna(subset=[col])
+        fig.add_trace(go.Scatter(x=line[x_col], y=line[col], name=col, mode="lines",
+                                 line=dict(dash="dash" if line.index.isin(bounds.index).any() else "solid")))
+
+    fig.update_layout(
+        title=f"Évolution de {', '.join(y_cols)} en fonction de {x_col}",
+        xaxis_title=x_col,
+        template="plotly_dark" if dark_mode else "plotly_white",
+        hovermode="x unified"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+def plot_time_rollup(df, x_col, y_col, dark_mode=False):
+    """Évolution temporelle à partir des rollups : granularité adaptée à la plage zoomée"""
+    rollups = get_rollups(df, x_col, y_col)
+    if rollups is None:
+        st.info("Aucune donnée disponible pour l’évolution temporelle.")
+        return
+
+    # Zoom : la plage choisie détermine la granularité (plus fine quand la plage se resserre)
+    start, end = rollups["start"].to_pydatetime(), rollups["end"].to_pydatetime()
+    if start < end:
+        start, end = st.slider(
+            "Période affichée",
+            min_value=start,
+            max_value=end,
+            value=(start, end),
+            step=max((end - start) / 500, timedelta(seconds=1)),
+            key=f"zoom_{x_col}_{y_col}"
+        )
+    level, data = select_rollup(rollups, start, end)
+
+    template = "plotly_dark" if dark_mode else "plotly_white"
+    title = f"Évolution de {y_col} en fonction de {x_col}"
+
+    if level == RAW_LEVEL:
+        fig = go.Figure(go.Scatter(
+            x=data.index, y=data["valeur"], name=y_col,
+            mode="lines+markers" if len(data) <= TS_MARKERS_MAX_POINTS else "lines"
+        ))
+    else:
+        title += f" (agrégation par {level})"
+        line_color = "#8b5cf6" if dark_mode else "#636EFA"
+        fig = go.Figure([
+            go.Scatter(x=data.index, y=data["max"], name="max", mode="lines",
+                       line=dict(width=0), showlegend=False),
+            go.Scatter(x=data.index, y=data["min"], name="min – max", mode="lines",
+                       line=dict(width=0), fill="tonexty", fillcolor="rgba(99, 110, 250, 0.2)"),
+            go.Scatter(x=data.index, y=data["mean"], name="moyenne", mode="lines",
+                       line=dict(color=line_color), customdata=data["count"],
+                       hovertemplate="%{y}<br>n = %{customdata}"),
+        ])
+
+    fig.update_layout(
+        title=title,
+        template=template,
+        xaxis_title=x_col,
+        yaxis_title=y_col,
+        hovermode="x unified"
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{len(data):,} points affichés – granularité : {level}")
+
 
 __all__ = [
     "plot_distribution",
@@ -1,13 +1,25 @@
 # pages/analyse.py
 import streamlit as st
+import numpy as np
 import pandas as pd
+from config.settings import FREQ_PIE_TOP_N, OUTLIER_ISOLATION_FOREST, PROGRESSIVE_CONFIDENCE
+from core.backend import get_backend, is_lazy, between, isin
+from core.cache import dataset_version, mask_key
+from core.outliers import METHODS, outlier_flags, outlier_mask
+from core.sampling import correlation_interval, progressive_sample, use_progressive
+from core.scheduler import cancel_background, run_in_background
+from core.stats import describe_all
+from ui.data_grid import render_data_grid
 from core.visualization import (
     plot_distribution, plot_box, plot_violin, plot_density,
     plot_bar, plot_pie, plot_donut, plot_scatter,
-    plot_line_evolution, plot_correlation_heatmap, plot_pairplot,
+    plot_line_evolution, plot_correlation_heatmap, plot_association_heatmap, plot_pairplot,
     plot_parallel_coordinates, plot_radar_chart, plot_gauge_chart, plot_waterfall_chart
 )
 
+OUTLIER_MODES = ["Toutes les lignes", "Exclure les valeurs aberrantes", "Seulement les valeurs aberrantes"]
+MISSING_LABEL = "(valeurs manquantes)"  # Option des filtres catégoriels
+
 # === Interprétations automatiques ===
 def interpret_distribution(df, col):
     data = df[col].dropna()
@@ -38,7 +50,7 @@ def interpret_boxplot(df, col):
     if outliers > 0:
         st.warning(f"{outliers} outliers détectés")
 
-def interpret_scatter(df, x, y):
+def interpret_scatter(df, x, y, approximate=False):
     data = df[[x, y]].dropna()
     if data.empty or len(data) < 2:
         return
@@ -46,12 +58,17 @@ def interpret_scatter(df, x, y):
     strength = "forte" if abs(corr) > 0.7 else "modérée" if abs(corr) > 0.3 else "faible"
     direction = "positive" if corr > 0 else "négative" if corr < 0 else "aucune"
     st.markdown("### 💡 Interprétation du nuage de points")
-    st.success(f"Corrélation {strength} {direction} (r = {corr:.3f})")
+    if approximate:
+        low, high = correlation_interval(corr, len(data))
+        st.success(f"Corrélation {strength} {direction} (r ≈ {corr:.3f}, IC {PROGRESSIVE_CONFIDENCE:.0%} : "
+                   f"[{low:.3f} ; {high:.3f}], échantillon)")
+    else:
+        st.success(f"Corrélation {strength} {direction} (r = {corr:.3f})")
 
 def main(df):
     st.title("🔍 Analyses Exploratoires Avancées")
 
-    if df is None or df.empty:
+    if df is None or (not is_lazy(df) and df.empty):
         st.info("Chargez des données via la barre latérale pour commencer.")
         return
 
@@ -63,23 +80,57 @@ def main(df):
     categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
     all_cols = df.columns.tolist()
 
-    # Filtrage dynamique
+    # Filtrage dynamique : un masque booléen sur df (sert aussi de clé au cache des fréquences)
     st.sidebar.header("🔧 Filtres dynamiques")
-    filtered_df = df.copy()
+    backend = get_backend(df)
+    filters = []
 
     for col in numeric_cols:
         if st.sidebar.checkbox(f"Filtrer {col}"):
-            min_val = float(df[col].min())
-            max_val = float(df[col].max())
+            mins, maxs = backend.numeric_bounds(df, numeric_cols)
+            min_val = float(mins[col])
+            max_val = float(maxs[col])
             range_val = st.sidebar.slider(f"{col}", min_val, max_val, (min_val, max_val))
-            filtered_df = filtered_df[(filtered_df[col] >= range_val[0]) & (filtered_df[col] <= range_val[1])]
+            filters.append(between(col, *range_val))
 
     for col in categorical_cols:
         if st.sidebar.checkbox(f"Filtrer {col}"):
-            selected = st.sidebar.multiselect(f"Valeurs {col}", df[col].unique(), default=df[col].unique())
-            filtered_df = filtered_df[filtered_df[col].isin(selected)]
-
-    st.sidebar.success(f"{len(filtered_df):,} lignes après filtrage")
+            # Valeurs manquantes proposées comme une modalité : tout garder ne retire aucune ligne
+            modalities = backend.value_counts(df, col).index.tolist() + [MISSING_LABEL]
+            selected = st.sidebar.multiselect(f"Valeurs {col}", modalities, default=modalities)
+            filters.append(isin(col, [v for v in selected if v != MISSING_LABEL], missing=MISSING_LABEL in selected))
+
+    mask = backend.filter_mask(df, filters)
+
+    # Valeurs aberrantes : drapeaux calculés une fois par version sur toutes les colonnes numériques
+    outliers = None if is_lazy(df) else outlier_flags(df)
+    if outliers is not None:
+        mode = st.sidebar.selectbox("Valeurs aberrantes", OUTLIER_MODES)
+        if mode != OUTLIER_MODES[0]:
+            available = [name for name in METHODS if name != "Isolation Forest" or OUTLIER_ISOLATION_FOREST]
+            methods = st.sidebar.multiselect("Méthodes de détection", available, default=available[:1])
+            if methods:
+                flagged = outlier_mask(outliers[0], methods)
+                keep = ~flagged if mode == OUTLIER_MODES[1] else flagged
+                mask = keep if mask is None else mask & keep
+    # Sans filtre, le même objet df est conservé (caches par version réutilisés)
+    filtered_df = df if mask is None else df[mask]
+
+    st.sidebar.success(f"{backend.count(filtered_df):,} lignes après filtrage")
+    # Lignes filtrées complètes (évolution temporelle par rollups, statistiques exactes)
+    full_df = filtered_df
+    progressive = not is_lazy(df) and use_progressive(df)
+    # Données partitionnées : graphiques et interprétations sur un échantillon en mémoire
+    if is_lazy(df):
+        filtered_df = backend.sample(filtered_df)
+        st.caption(f"Mode grand volume : graphiques sur un échantillon de {len(filtered_df):,} lignes, "
+                   "fréquences calculées sur l'ensemble des données.")
+    elif progressive:
+        # Mode progressif : échantillon stratifié tiré une fois par version, puis filtré
+        sample, positions, _ = progressive_sample(df)
+        filtered_df = sample if mask is None else sample[np.asarray(mask)[positions]]
+        st.caption(f"Mode progressif : graphiques et interprétations approximatifs, sur un échantillon stratifié "
+                   f"de {len(filtered_df):,} lignes ; fréquences et évolutions temporelles sur l'ensemble des données.")
 
     # Colonnes après filtrage
     numeric_cols_f = filtered_df.select_dtypes(include='number').columns.tolist()
@@ -99,9 +150,12 @@ def main(df):
         plot_violin(filtered_df, col, dark_mode=dark_mode)
         plot_density(filtered_df, col, dark_mode=dark_mode)
         if col in categorical_cols_f:
-            plot_bar(filtered_df, col, dark_mode=dark_mode)
-            plot_pie(filtered_df, col, dark_mode=dark_mode)
-            plot_donut(filtered_df, col, dark_mode=dark_mode)
+            # Comptage unique (cache par version + masque) partagé par les trois graphiques
+            counts = backend.value_counts(df, col, mask=mask)
+            pie_counts = backend.value_counts(df, col, mask=mask, top_n=FREQ_PIE_TOP_N, other=True)
+            plot_bar(filtered_df, col, dark_mode=dark_mode, counts=counts)
+            plot_pie(filtered_df, col, dark_mode=dark_mode, counts=pie_counts)
+            plot_donut(filtered_df, col, dark_mode=dark_mode, counts=pie_counts)
 
     with tab_bi:
         st.subheader("Analyse bivariée")
@@ -113,20 +167,25 @@ def main(df):
         size = None if size == "Aucun" else size
 
         plot_scatter(filtered_df, x, y, color_col=color, size_col=size, dark_mode=dark_mode)
-        interpret_scatter(filtered_df, x, y)
-        plot_line_evolution(filtered_df, x, y, dark_mode=dark_mode)
+        interpret_scatter(filtered_df, x, y, approximate=progressive)
+        # Axe temporel : rollups agrégés sur toutes les lignes filtrées
+        line_df = full_df if progressive and pd.api.types.is_datetime64_any_dtype(df[x]) else filtered_df
+        plot_line_evolution(line_df, x, y, dark_mode=dark_mode)
 
     with tab_multi:
         st.subheader("Analyse multivariée – Relations entre plusieurs variables")
 
         # Heatmap de corrélation (toujours visible)
         plot_correlation_heatmap(filtered_df, dark_mode=dark_mode)
+        if categorical_cols_f:
+            plot_association_heatmap(filtered_df, dark_mode=dark_mode)
 
         # Pairplot (lourd – sur bouton)
         if len(numeric_cols_f) >= 3:
-            if st.button("Générer Pairplot complet (scatter matrix)"):
-                with st.spinner("Génération du pairplot en cours..."):
-                    plot_pairplot(filtered_df, dark_mode=dark_mode)
+            if st.toggle("Générer Pairplot complet (scatter matrix)", key="pairplot_on"):
+                plot_pairplot(filtered_df, dark_mode=dark_mode)
+            else:
+                cancel_background("pairplot")
         else:
             st.info("Au moins 3 colonnes numériques nécessaires pour le pairplot.")
 
@@ -165,7 +224,21 @@ def main(df):
 
         # Statistiques descriptives finales
         st.subheader("Statistiques descriptives globales")
-        st.dataframe(filtered_df.describe(include='all'), use_container_width=True)
-
-        st.subheader("Aperçu des données filtrées")
-        st.dataframe(filtered_df.head(20), use_container_width=True)
\ No newline at end of file
+        summary = None
+        if progressive:
+            summary = run_in_background("describe", (dataset_version(df), mask_key(mask), "describe"),
+                                        describe_all, full_df, label="Statistiques exactes")
+            if summary is None:
+                st.caption("Valeurs approximatives (échantillon), remplacées dès la fin du calcul exact.")
+        if summary is None:
+            summary = describe_all(filtered_df)
+        st.dataframe(summary, use_container_width=True)
+
+        st.subheader("Explorer les données filtrées")
+        # Pagination serveur : seule la page visible est envoyée au navigateur
+        if is_lazy(df):
+            st.caption(f"Données hors mémoire : exploration limitée à un échantillon de {len(filtered_df):,} lignes "
+                       "(filtres appliqués), et non au jeu complet.")
+            render_data_grid(filtered_df, key="analyse_grid")
+        else:
+            render_data_grid(df, key="analyse_grid", mask=mask)
\ No newline at end of file
@@ -1,48 +1,56 @@
 # pages/dashboard.py
 import streamlit as st
-import pandas as pd
-import numpy as np
-
-# === Fonction pour calculer l'indice de Gini ===
-def gini_coefficient(x):
-    """Calcule l'indice de Gini pour une série de valeurs numériques positives"""
-    x = np.array(x.dropna())
-    if len(x) == 0:
-        return np.nan
-    if np.any(x < 0):
-        st.warning("L'indice de Gini est calculé sur des valeurs absolues (négatives ignorées).")
-        x = np.abs(x)
-    x = np.sort(x)
-    n = len(x)
-    cumx = np.cumsum(x)
-    gini = (2 * np.sum((np.arange(1, n+1) * x)) / (n * cumx[-1])) - (n + 1) / n
-    return round(gini, 4)
+from config.settings import COMPUTE_BACKEND, OUTLIER_ISOLATION_FOREST, PROGRESSIVE_CONFIDENCE
+from core.associations import associations
+from core.backend import get_backend, is_lazy
+from core.cache import dataset_version
+from core.outliers import METHODS, outlier_flags, rows_by_method
+from core.sampling import (
+    correlation_intervals, extrapolate_counts, mean_intervals, progressive_sample, use_progressive
+)
+from core.scheduler import run_in_background
+from core.stats import compute_dashboard_stats, spearman_correlation
 
 def main(df):
     st.title("📊 Tableau de bord – Statistiques descriptives et analytiques")
 
-    if df is None or df.empty:
+    if df is None or (not is_lazy(df) and df.empty):
         st.info("Aucune donnée chargée. Utilisez la barre latérale pour uploader un fichier.")
         return
 
+    if COMPUTE_BACKEND != "pandas" and get_backend().name != COMPUTE_BACKEND:
+        st.warning(f"Moteur « {COMPUTE_BACKEND} » indisponible (paquet non installé) : calculs avec pandas.")
+    # Spearman (tri de chaque colonne) est calculé à part, en arrière-plan
+    sample = None
+    if use_progressive(df):
+        # Mode progressif : échantillon stratifié affiché d'abord, remplacé par les valeurs exactes
+        stats = run_in_background("dashboard_stats", (dataset_version(df), "dashboard_stats"),
+                                  compute_dashboard_stats, df, None, ("pearson",), label="Calcul exact des statistiques")
+        if stats is None:
+            sample, _, strata_col = progressive_sample(df)
+            # Effectifs de l'échantillon extrapolés au jeu complet (doublons en attente du calcul exact)
+            stats = extrapolate_counts(compute_dashboard_stats(sample, correlation_methods=("pearson",)),
+                                       len(df), len(sample))
+            strata = f", strates : {strata_col}" if strata_col else ""
+            st.warning(f"Valeurs approximatives : échantillon stratifié de {len(sample):,} lignes sur {len(df):,}"
+                       f"{strata}, effectifs extrapolés au jeu complet. Elles seront remplacées par les "
+                       f"valeurs exactes dès la fin du calcul.")
+    else:
+        stats = compute_dashboard_stats(df, correlation_methods=("pearson",))
+    st.caption(f"Moteur de calcul : {stats['backend']}")
+    if stats["approximate"]:
+        st.caption(f"Données hors mémoire : {stats['approximate']}.")
+
     # === 1. Statistiques descriptives numériques avec Gini ===
     st.header("1. Statistiques descriptives numériques (avec indice de Gini)")
 
-    numeric_cols = df.select_dtypes(include='number').columns.tolist()
-    if numeric_cols:
-        desc = df[numeric_cols].describe(percentiles=[.05, .1, .25, .5, .75, .9, .95]).T
-        desc['mode'] = df[numeric_cols].mode().iloc[0]
-        desc['skewness'] = df[numeric_cols].skew()
-        desc['kurtosis'] = df[numeric_cols].kurtosis()
-        desc['variance'] = df[numeric_cols].var()
-        desc['cv (%)'] = (desc['std'] / desc['mean'] * 100).round(2)
-        
-        # Ajout de l'indice de Gini
-        gini_values = [gini_coefficient(df[col]) for col in numeric_cols]
-        desc['Gini'] = gini_values
-        
-        desc = desc.round(3)
-        st.dataframe(desc, use_container_width=True)
+    if stats["numeric"] is not None:
+        if stats["has_negative"]:
+            st.warning("L'indice de Gini est calculé sur des valeurs absolues (négatives ignorées).")
+        st.dataframe(stats["numeric"], use_container_width=True)
+        if sample is not None:
+            st.caption(f"Intervalles de confiance à {PROGRESSIVE_CONFIDENCE:.0%} des moyennes (échantillon)")
+            st.dataframe(mean_intervals(sample, stats["numeric_cols"], len(df)), use_container_width=True)
         
         st.info("**Indice de Gini** : 0 = égalité parfaite, 1 = inégalité maximale. Très utilisé pour mesurer la concentration (revenus, ventes, etc.).")
     else:
@@ -51,17 +59,9 @@ def main(df):
     # === 2. Statistiques de fréquence et répartition ===
     st.header("2. Statistiques de fréquence et répartition")
 
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-    if categorical_cols:
-        for col in categorical_cols:
+    if stats["frequencies"]:
+        for col, table in stats["frequencies"].items():
             with st.expander(f"Répartition de {col}"):
-                freq = df[col].value_counts().head(20)
-                freq_rel = df[col].value_counts(normalize=True).head(20) * 100
-                table = pd.DataFrame({
-                    "Valeur": freq.index.astype(str),
-                    "Fréquence absolue": freq.values,
-                    "Fréquence relative (%)": freq_rel.values.round(2)
-                })
                 st.dataframe(table, use_container_width=True)
     else:
         st.info("Aucune colonne catégorielle détectée.")
@@ -69,55 +69,83 @@ def main(df):
     # === 3. Qualité des données ===
     st.header("3. Statistiques de qualité des données")
 
-    missing = df.isna().sum()
-    missing_pct = (missing / len(df)) * 100
-    quality = pd.DataFrame({
-        "Colonne": df.columns,
-        "Valeurs manquantes": missing.values,
-        "Taux manquant (%)": missing_pct.round(2).values,
-        "Doublons totaux": [df.duplicated().sum()] * len(df.columns)
-    })
-    st.dataframe(quality, use_container_width=True)
+    st.dataframe(stats["quality"], use_container_width=True)
 
+    metrics = stats["quality_metrics"]
     col1, col2, col3 = st.columns(3)
-    col1.metric("Taux global de valeurs manquantes", f"{missing_pct.mean():.2f}%")
-    col2.metric("Nombre de lignes dupliquées", df.duplicated().sum())
-    col3.metric("Complétude moyenne", f"{(1 - missing_pct.mean()/100)*100:.2f}%")
+    col1.metric("Taux global de valeurs manquantes", f"{metrics['missing_pct']:.2f}%")
+    col2.metric("Nombre de lignes dupliquées",
+                "calcul en cours" if metrics["duplicates"] is None else metrics["duplicates"])
+    col3.metric("Complétude moyenne", f"{metrics['completeness']:.2f}%")
 
     # === 4. Statistiques bivariées (corrélations) ===
     st.header("4. Statistiques bivariées (corrélations)")
 
-    if len(numeric_cols) >= 2:
-        corr_pearson = df[numeric_cols].corr(method='pearson')
-        corr_spearman = df[numeric_cols].corr(method='spearman')
+    if stats["correlations"] is not None:
         st.subheader("Corrélation de Pearson")
-        st.dataframe(corr_pearson.round(3), use_container_width=True)
+        st.dataframe(stats["correlations"]["pearson"].round(3), use_container_width=True)
+        if sample is not None:
+            with st.expander(f"Intervalles de confiance à {PROGRESSIVE_CONFIDENCE:.0%} (z de Fisher, échantillon)"):
+                st.dataframe(correlation_intervals(sample, stats["numeric_cols"]), use_container_width=True,
+                             hide_index=True)
         st.subheader("Corrélation de Spearman")
-        st.dataframe(corr_spearman.round(3), use_container_width=True)
+        numeric_df = get_backend(df).sample(df)[stats["numeric_cols"]]
+        spearman = run_in_background("spearman", (dataset_version(df), "spearman", tuple(stats["numeric_cols"])),
+                                     spearman_correlation, numeric_df, label="Corrélation de Spearman")
+        if spearman is not None:
+            st.dataframe(spearman.round(3), use_container_width=True)
     else:
         st.info("Pas assez de colonnes numériques pour les corrélations.")
 
+    # Associations et valeurs aberrantes : échantillon en mode progressif ou partitionné
+    source = progressive_sample(df)[0] if use_progressive(df) else get_backend(df).sample(df)
+    if stats["categorical_cols"]:
+        st.subheader("Associations entre variables (V de Cramér, rapport de corrélation η)")
+        if source is not df:
+            st.caption(f"Calculé sur un échantillon de {len(source):,} lignes.")
+        st.dataframe(associations(source).round(3), use_container_width=True)
+        st.caption("V de Cramér entre qualitatives et η entre qualitative et numérique : de 0 (aucun lien) à 1 ; "
+                   "Pearson entre numériques.")
+
     # === 5. Statistiques temporelles ===
     st.header("5. Statistiques temporelles")
 
-    date_cols = df.select_dtypes(include='datetime64[ns]').columns.tolist()
-    if date_cols:
-        date_col = date_cols[0]
-        st.write(f"Analyse temporelle sur **{date_col}**")
-        df_sorted = df.sort_values(date_col).dropna(subset=[date_col])
-        duration_days = (df_sorted[date_col].max() - df_sorted[date_col].min()).days
-        st.metric("Durée totale (jours)", duration_days)
-        st.metric("Nombre de dates uniques", df_sorted[date_col].dt.date.nunique())
+    temporal = stats["temporal"]
+    if temporal is not None:
+        st.write(f"Analyse temporelle sur **{temporal['date_col']}**")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Durée totale (jours)", temporal["duration_days"])
+        col2.metric("Nombre de dates uniques", temporal["unique_dates"])
+        col3.metric("Observations par jour (moy.)", f"{temporal['mean_per_day']:.1f}")
+        col4.metric("Mois le plus actif", temporal["busiest_month"])
     else:
         st.info("Aucune colonne de type date détectée.")
 
     # === 6. KPI et indicateurs globaux ===
     st.header("6. Indicateurs clés (KPI)")
 
+    kpi = stats["kpi"]
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Observations totales", len(df))
-    col2.metric("Variables", len(df.columns))
-    col3.metric("Taux de complétude moyen", f"{(1 - df.isna().mean().mean()) * 100:.2f}%")
-    col4.metric("Densité de données", f"{(df.notna().sum().sum() / (len(df) * len(df.columns))) * 100:.2f}%")
+    col1.metric("Observations totales", kpi["rows"])
+    col2.metric("Variables", kpi["columns"])
+    col3.metric("Taux de complétude moyen", f"{kpi['completeness']:.2f}%")
+    col4.metric("Densité de données", f"{kpi['density']:.2f}%")
+
+    # === 7. Valeurs aberrantes ===
+    st.header("7. Valeurs aberrantes")
+
+    outliers = outlier_flags(source) if stats["numeric_cols"] else None
+    if outliers is not None:
+        flags, summary = outliers
+        if source is not df:
+            st.caption(f"Calculé sur un échantillon de {len(source):,} lignes.")
+        rows = rows_by_method(flags)
+        methods = [name for name in METHODS if name != "Isolation Forest" or OUTLIER_ISOLATION_FOREST]
+        for column, name in zip(st.columns(len(methods)), methods):
+            column.metric(f"Lignes signalées ({name})", f"{rows[name]:,}", f"{rows[name] / max(len(flags), 1):.2%}",
+                          delta_color="off")
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+    else:
+        st.info("Aucune colonne numérique détectée.")
 
-    st.success("Toutes les statistiques descriptives et analytiques sont disponibles sous forme tabulaire.")
\ No newline at end of file
+    st.success("Toutes les statistiques descriptives et analytiques sont disponibles sous forme tabulaire.")
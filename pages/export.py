@@ -3,87 +3,66 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import os
-import base64
 from io import BytesIO
-from weasyprint import HTML
 import plotly.express as px
-import plotly.io as pio
+from config.settings import REPORT_TOP_N, REPORT_MAX_FREQUENCY_TABLES
+from core.backend import get_backend
+from ui.report_generator import ReportBuilder, chart_sample
 
-def generate_graph_images(df):
-    images = {}
+def generate_figures(df):
+    """Graphiques du rapport PDF (nuage de points et boîte sur un échantillon borné)"""
+    figures = {}
     numeric_cols = df.select_dtypes(include='number').columns.tolist()
 
     if len(numeric_cols) >= 2:
         # Heatmap
-        fig = px.imshow(df[numeric_cols].corr(), text_auto=".2f", color_continuous_scale='RdBu_r')
-        images['correlation'] = base64.b64encode(pio.to_image(fig, format="png", width=900, height=600)).decode()
+        corr = get_backend(df).correlations(df, numeric_cols, methods=("pearson",))["pearson"]
+        figures['Corrélation'] = px.imshow(corr, text_auto=".2f", color_continuous_scale='RdBu_r')
 
+        sample = chart_sample(df)
         # Scatter
-        fig = px.scatter(df, x=numeric_cols[0], y=numeric_cols[1], title=f"{numeric_cols[1]} vs {numeric_cols[0]}")
-        images['scatter'] = base64.b64encode(pio.to_image(fig, format="png", width=900, height=600)).decode()
+        figures['Scatter'] = px.scatter(sample, x=numeric_cols[0], y=numeric_cols[1], title=f"{numeric_cols[1]} vs {numeric_cols[0]}")
 
         # Box
-        fig = px.box(df, y=numeric_cols[0], title=f"Box Plot de {numeric_cols[0]}")
-        images['box'] = base64.b64encode(pio.to_image(fig, format="png", width=900, height=600)).decode()
+        figures['Box Plot'] = px.box(sample, y=numeric_cols[0], title=f"Box Plot de {numeric_cols[0]}")
 
         # Distribution
-        fig = px.histogram(df, x=numeric_cols[0], nbins=50, title=f"Distribution de {numeric_cols[0]}")
-        images['distribution'] = base64.b64encode(pio.to_image(fig, format="png", width=900, height=600)).decode()
-
-    return images
-
-def generate_pdf_report(df):
-    images = generate_graph_images(df)
-
-    html_content = f"""
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>Data Analytics Pro - Rapport du {datetime.now().strftime('%d/%m/%Y')}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; color: #333; }}
-            h1 {{ color: #1e40af; text-align: center; }}
-            h2 {{ color: #2563eb; }}
-            table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-            th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
-            th {{ background-color: #f0f9ff; }}
-            img {{ max-width: 100%; height: auto; margin: 20px 0; }}
-        </style>
-    </head>
-    <body>
-        <h1>Data Analytics Pro - Rapport</h1>
-        <p><strong>Date :</strong> {datetime.now().strftime('%d/%m/%Y à %H:%M')}</p>
-        <p><strong>Données :</strong> {len(df):,} lignes × {len(df.columns)} colonnes</p>
-
-        <h2>Statistiques</h2>
-        {df.describe(include='all').to_html()}
-
-        <h2>Aperçu</h2>
-        {df.head(20).to_html(index=False)}
-
-        {f'<h2>Corrélation</h2><img src="data:image/png;base64,{images.get("correlation")}">' if 'correlation' in images else ''}
-
-        {f'<h2>Scatter</h2><img src="data:image/png;base64,{images.get("scatter")}">' if 'scatter' in images else ''}
-
-        {f'<h2>Box Plot</h2><img src="data:image/png;base64,{images.get("box")}">' if 'box' in images else ''}
-
-        {f'<h2>Distribution</h2><img src="data:image/png;base64,{images.get("distribution")}">' if 'distribution' in images else ''}
-    </body>
-    </html>
-    """
-
-    pdf_file = f"rapport_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-    HTML(string=html_content).write_pdf(pdf_file)
-    return pdf_file
-
-def generate_excel_report(df):
+        figures['Distribution'] = px.histogram(df, x=numeric_cols[0], nbins=50, title=f"Distribution de {numeric_cols[0]}")
+
+    return figures
+
+def generate_pdf_report(df, output_path=None):
+    """Rapport PDF (moteur ui.report_generator : tableaux bornés, graphiques SVG, budget)"""
+    backend = get_backend(df)
+    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+
+    with ReportBuilder("Data Analytics Pro - Rapport") as report:
+        report.add_text(None, f"Données : {len(df):,} lignes × {len(df.columns)} colonnes")
+        report.add_table("Statistiques", df.describe(include='all').T)
+        report.add_table("Aperçu", df.head(20), index=False)
+        for col in categorical_cols[:REPORT_MAX_FREQUENCY_TABLES]:
+            report.add_table(f"Top {REPORT_TOP_N} – {col}", backend.frequency_table(df, col, top_n=REPORT_TOP_N), index=False)
+        for title, fig in generate_figures(df).items():
+            report.add_figure(title, fig)
+        pdf_file = output_path or f"rapport_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
+        return report.write_pdf(pdf_file)
+
+def generate_excel_report(df, stats=None):
+    """Classeur Excel des données ; `stats` (core.stats.compute_dashboard_stats) ajoute les tables du tableau de bord"""
     output = BytesIO()
     with pd.ExcelWriter(output, engine='openpyxl') as writer:
         df.to_excel(writer, sheet_name='Données', index=False)
         df.describe(include='all').to_excel(writer, sheet_name='Statistiques')
-        numeric = df.select_dtypes(include='number')
-        if len(numeric.columns) >= 2:
-            numeric.corr().to_excel(writer, sheet_name='Corrélation')
+        numeric_cols = df.select_dtypes(include='number').columns.tolist()
+        if len(numeric_cols) >= 2:
+            corr = get_backend().correlations(df, numeric_cols, methods=("pearson",))["pearson"]
+            corr.to_excel(writer, sheet_name='Corrélation')
+        if stats is not None:
+            if stats["numeric"] is not None:
+                stats["numeric"].to_excel(writer, sheet_name='Stats numériques')
+            stats["quality"].to_excel(writer, sheet_name='Qualité', index=False)
+            if stats["correlations"] is not None:
+                stats["correlations"]["spearman"].to_excel(writer, sheet_name='Spearman')
     output.seek(0)
     return output.getvalue()
 
@@ -1,5 +1,15 @@
 # pages/ml.py
 import streamlit as st
+from config.settings import FORECAST_HORIZON, FORECAST_ALPHA
+from core.backend import get_backend
+from core.cache import dataset_version
+from core.forecasting import (
+    MODELS, FREQUENCIES, grouped_series, model_spec, cached_models, store_models, fit_groups, forecast,
+    fit_summary
+)
+from core.ml_engine import train_models, show_ml_results
+from core.scheduler import run_in_background, cancel_background
+from core.visualization import plot_line_evolution
 
 def main(df):
     st.title("🤖 Machine Learning")
@@ -8,5 +18,84 @@ def main(df):
         st.info("Chargez des données pour commencer.")
         return
 
-    st.write("Fonctionnalités ML en cours de développement...")
-    st.info("Bientôt : clustering K-Means, régression, classification")
\ No newline at end of file
+    numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    if len(numeric_cols) < 2:
+        st.info("Au moins 2 colonnes numériques nécessaires (une cible et une variable explicative).")
+    else:
+        st.write("**Random Forest et XGBoost** – classification (moins de 10 classes) ou régression")
+        target = st.selectbox("Variable cible", numeric_cols, key="ml_target")
+
+        # Entraînement en arrière-plan : changer de cible remplace (annule) l'entraînement précédent
+        if st.toggle("Entraîner les modèles", key="ml_train"):
+            data = get_backend(df).sample(df)  # Mode grand volume / source SQL : échantillon en mémoire
+            try:
+                result = run_in_background("ml", (dataset_version(data), "ml", target), train_models, data, target,
+                                           label="Entraînement des modèles")
+            except ValueError as e:
+                st.error(str(e))
+                result = None
+            if result is not None:
+                show_ml_results(result)
+        else:
+            cancel_background("ml")
+
+    # Données complètes : pour une source hors mémoire, seules les colonnes utiles sont chargées
+    show_forecasts(df, numeric_cols)
+
+    st.info("Bientôt : clustering K-Means")
+
+def show_forecasts(df, numeric_cols):
+    """Prévisions par groupe : ajustement en arrière-plan des seules séries absentes du cache"""
+    st.subheader("📈 Prévisions de séries temporelles")
+    date_cols = df.select_dtypes(include='datetime').columns.tolist()
+    if not date_cols or not numeric_cols:
+        st.info("Une colonne date et une colonne numérique sont nécessaires pour les prévisions.")
+        return
+
+    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        date_col = st.selectbox("Colonne date", date_cols, key="forecast_date")
+        freq = FREQUENCIES[st.selectbox("Période", list(FREQUENCIES), index=2, key="forecast_freq")]
+    with col2:
+        value_col = st.selectbox("Valeur à prévoir", numeric_cols, key="forecast_value")
+        agg = "sum" if st.radio("Agrégation", ["Somme", "Moyenne"], horizontal=True,
+                                key="forecast_agg") == "Somme" else "mean"
+    with col3:
+        group = st.selectbox("Une série par", ["Aucun"] + categorical_cols, key="forecast_group")
+        model = MODELS[st.selectbox("Modèle", list(MODELS), key="forecast_model")]
+    horizon = st.number_input("Horizon (périodes)", 1, 365, FORECAST_HORIZON, key="forecast_horizon")
+
+    group_col = None if group == "Aucun" else group
+    series = grouped_series(df, date_col, value_col, group_col, freq, agg)
+    if not series:
+        st.info("Aucune donnée datée disponible.")
+        return
+    # Version propre aux séries : date, valeur, groupe et agrégation font partie de la clé des modèles
+    version = (dataset_version(df), date_col, value_col, group_col, agg)
+    spec = model_spec(model, freq)
+    fitted, missing = cached_models(version, list(series), spec)
+
+    if st.toggle(f"Ajuster les modèles ({len(series)} séries)", key="forecast_on"):
+        if missing:
+            # Tâche déjà exécutée dans un processus de travail : ajustement en série (pas de pool imbriqué)
+            result = run_in_background("forecast", (version, spec, tuple(missing)), fit_groups,
+                                       {g: series[g] for g in missing}, spec, 1,
+                                       label=f"Ajustement de {len(missing)} séries")
+            if result is not None:
+                store_models(version, spec, result)
+                fitted.update(result)
+    else:
+        cancel_background("forecast")
+
+    ready = [g for g in series if "params" in fitted.get(g, {})]
+    if ready:
+        shown = st.selectbox("Série affichée", ready, key="forecast_shown")
+        frame = forecast(series[shown], spec, fitted[shown], int(horizon), FORECAST_ALPHA)
+        plot_line_evolution(frame, "date", ["historique", "prévision"],
+                            dark_mode=st.session_state.get("theme", "dark") == "dark",
+                            band=("borne basse", "borne haute", f"intervalle {1 - FORECAST_ALPHA:.0%}"))
+        with st.expander("📋 Valeurs prévues"):
+            st.dataframe(frame.dropna(subset=["borne basse"]).drop(columns="historique"), use_container_width=True)
+    if fitted:
+        st.dataframe(fit_summary(series, fitted), use_container_width=True)
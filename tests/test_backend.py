@@ -0,0 +1,52 @@
+# tests/test_backend.py
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import stats
+from core.backend import DaskBackend, PandasBackend, PolarsBackend, POLARS_AVAILABLE, SqlBackend, isin
+from core.sources import open_source
+
+DF = pd.DataFrame({"cat": ["a", None, "b", "a", None], "x": [1.0, 2.0, 3.0, 4.0, 5.0]})
+
+def _kept(backend, df, filters):
+    if isinstance(backend, SqlBackend):
+        return sorted(df[backend.filter_mask(df, filters)].query('"x"')["x"])
+    mask = backend.filter_mask(df, filters)
+    if isinstance(backend, DaskBackend):
+        return sorted(df[mask]["x"].compute())
+    return sorted(DF["x"][mask])
+
+def _frames(tmp_path):
+    yield PandasBackend(), DF
+    if POLARS_AVAILABLE:
+        yield PolarsBackend(), DF
+    dd = pytest.importorskip("dask.dataframe")
+    yield DaskBackend(), dd.from_pandas(DF, npartitions=2)
+    path = tmp_path / "filtres.db"
+    with closing(sqlite3.connect(path)) as con:
+        DF.to_sql("t", con, index=False)
+    yield SqlBackend(), open_source(str(path))
+
+def test_isin_keeps_missing_only_when_selected(tmp_path):
+    for backend, df in _frames(tmp_path):
+        assert _kept(backend, df, [isin("cat", ["a", "b"], missing=True)]) == [1, 2, 3, 4, 5], backend.name
+        assert _kept(backend, df, [isin("cat", ["a"])]) == [1, 4], backend.name
+        assert _kept(backend, df, [isin("cat", [], missing=True)]) == [2, 5], backend.name
+
+def test_summaries_share_layout(tmp_path):
+    for backend, df in _frames(tmp_path):
+        desc = backend.numeric_summary(df, ["x"])
+        assert desc.columns.tolist() == stats.SUMMARY_COLUMNS, backend.name
+        assert desc.loc["x", "cv (%)"] == round(DF["x"].std() / DF["x"].mean() * 100, 2), backend.name
+        table, metrics = backend.quality_summary(df)
+        assert table["Valeurs manquantes"].tolist() == [2, 0] and metrics["duplicates"] == 0, backend.name
+
+def test_negative_minimum_not_hidden_by_rounding():
+    df = pd.DataFrame({"x": [-0.0001, 1.0, 2.0], "y": [0.0, 1.0, 2.0]})
+    result = stats.compute_dashboard_stats(df, backend=PandasBackend())
+    assert result["numeric"].loc["x", "min"] == 0
+    assert result["has_negative"] == ["x"]
@@ -0,0 +1,26 @@
+# tests/test_data_cleaner.py
+import numpy as np
+import pandas as pd
+
+from core.data_cleaner import DEFAULT_PIPELINE, drop_duplicates, fill_missing, run_pipeline
+
+def _affected(report, op):
+    return report.loc[report["Étape"] == op, "Lignes affectées"].tolist()
+
+def test_fill_after_drop_counts_only_kept_rows():
+    df = pd.DataFrame({"a": [1.0, np.nan, np.nan, 4.0], "b": ["x", "y", "y", "z"]})
+
+    result, report = run_pipeline(df, DEFAULT_PIPELINE)
+
+    assert len(result) == 3
+    assert result["a"].tolist() == [1.0, 0.0, 4.0]
+    assert _affected(report, "drop_duplicates") == [1]
+    assert _affected(report, "fill_missing") == [1]
+
+def test_drop_missing_after_drop_counts_only_kept_rows():
+    df = pd.DataFrame({"a": [np.nan, np.nan, 3.0, np.nan], "b": ["x", "x", "y", "z"]})
+
+    result, report = run_pipeline(df, [drop_duplicates(), fill_missing(numeric="drop")])
+
+    assert result["b"].tolist() == ["y"]
+    assert _affected(report, "fill_missing") == [2]
@@ -0,0 +1,13 @@
+# tests/test_data_grid.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from ui.data_grid import sort_order
+
+@pytest.mark.parametrize("tz", [None, "Europe/Paris"])
+def test_sort_order_datetimes_with_missing_last(tz):
+    series = pd.Series(pd.to_datetime(["2024-03-01", None, "2024-01-01", "2024-02-01"]).tz_localize(tz))
+
+    assert sort_order(series).tolist() == [2, 3, 0, 1]
+    assert sort_order(series, ascending=False).tolist() == [0, 3, 2, 1]
@@ -0,0 +1,40 @@
+# tests/test_data_loader.py
+import pandas as pd
+import pytest
+
+import core.data_loader as data_loader
+
+dd = pytest.importorskip("dask.dataframe")
+
+def test_read_lazy_keeps_text_when_a_later_partition_would_lose_values(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "DASK_BLOCKSIZE", 20_000)
+    rows = 5000
+    df = pd.DataFrame({
+        "propre": [f"{i},5" for i in range(rows)],
+        "code": [f"{i} 000" for i in range(rows - 1)] + ["0 123"],
+        "montant": [f"{i},25" for i in range(rows - 1)] + ["1,234.5"],
+        "jour": ["01/02/2020"] * (rows - 1) + ["2020-02-01"],
+    })
+    path = tmp_path / "gros.csv"
+    df.to_csv(path, index=False)
+
+    ddf = data_loader.read_lazy(str(path))
+    assert ddf.npartitions > 1
+    result = ddf.compute()
+
+    assert pd.api.types.is_float_dtype(result["propre"])
+    assert result["propre"].iloc[-1] == rows - 0.5
+    for col in ("code", "montant", "jour"):
+        assert not pd.api.types.is_numeric_dtype(result[col])
+        assert not pd.api.types.is_datetime64_any_dtype(result[col])
+        assert result[col].iloc[-1] == df[col].iloc[-1]
+
+def test_append_counts_duplicates_across_upcast_columns():
+    base = pd.DataFrame({"x": [1, 2, 3], "c": ["a", "b", "c"]})
+    new = pd.DataFrame({"x": [1.0, float("nan")], "c": ["a", "d"]})
+
+    combined = data_loader.append_data(base, new)
+    combined = data_loader.append_data(combined, pd.DataFrame({"x": [2.0, float("nan")], "c": ["b", "d"]}))
+
+    table, metrics = data_loader.running_stats(combined).quality_summary()
+    assert metrics["duplicates"] == combined.duplicated().sum() == 3
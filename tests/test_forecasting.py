@@ -0,0 +1,75 @@
+# tests/test_forecasting.py
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import core.forecasting as forecasting
+from core.forecasting import build_series, grouped_series
+from core.sources import open_source
+
+def _sales(rows=5000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "date": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D"),
+        "magasin": rng.choice(["A", "B", "C"], rows),
+        "ventes": rng.integers(1, 100, rows).astype(float),
+        "autre": rng.random(rows),
+    })
+
+def _assert_same_series(result, expected):
+    assert result.keys() == expected.keys()
+    for group, series in expected.items():
+        pd.testing.assert_series_equal(result[group], series, check_names=False, check_freq=False)
+
+@pytest.fixture
+def loaded_columns(monkeypatch):
+    """Colonnes ramenées en mémoire par le chargement d'une source hors mémoire"""
+    loaded = []
+    load = forecasting._load_columns
+
+    def spy(df, cols):
+        loaded.append(list(cols))
+        return load(df, cols)
+
+    monkeypatch.setattr(forecasting, "_load_columns", spy)
+    return loaded
+
+def test_grouped_series_sql_source_uses_all_rows(tmp_path, loaded_columns):
+    df = _sales()
+    path = tmp_path / "ventes.db"
+    with closing(sqlite3.connect(path)) as con:
+        con.execute("CREATE TABLE ventes (date TIMESTAMP, magasin TEXT, ventes REAL, autre REAL)")
+        con.executemany("INSERT INTO ventes VALUES (?, ?, ?, ?)",
+                        df.assign(date=df["date"].dt.strftime("%Y-%m-%d %H:%M:%S")).itertuples(index=False))
+        con.commit()
+
+    result = grouped_series(open_source(str(path)), "date", "ventes", "magasin", "MS")
+
+    assert loaded_columns == [["date", "ventes", "magasin"]]
+    _assert_same_series(result, build_series(df, "date", "ventes", "magasin", "MS"))
+    assert sum(s.sum() for s in result.values()) == df["ventes"].sum()
+
+def test_grouped_series_dask_frame_uses_all_rows(loaded_columns):
+    dd = pytest.importorskip("dask.dataframe")
+    df = _sales()
+
+    result = grouped_series(dd.from_pandas(df, npartitions=4), "date", "ventes", None, "W")
+
+    assert loaded_columns == [["date", "ventes"]]
+    _assert_same_series(result, build_series(df, "date", "ventes", None, "W"))
+
+def test_build_series_drops_incomplete_last_period_of_sums():
+    dates = pd.date_range("2023-01-01", "2023-03-15", freq="D")
+    df = pd.DataFrame({"date": dates, "ventes": 1.0})
+
+    sums = build_series(df, "date", "ventes", freq="MS")[forecasting.ALL_LABEL]
+    means = build_series(df, "date", "ventes", freq="MS", agg="mean")[forecasting.ALL_LABEL]
+    complete = build_series(df[df["date"] < "2023-03-01"].iloc[:-1], "date", "ventes", freq="MS")
+
+    assert sums.index[-1] == pd.Timestamp("2023-02-01")
+    assert sums.tolist() == [31.0, 28.0]
+    assert means.index[-1] == pd.Timestamp("2023-03-01")
+    assert complete[forecasting.ALL_LABEL].tolist() == [31.0]  # Février arrêté au 27 : incomplet
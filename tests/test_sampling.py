@@ -0,0 +1,17 @@
+# tests/test_sampling.py
+import numpy as np
+import pandas as pd
+
+from core.backend import PandasBackend
+from core.sampling import extrapolate_counts
+from core.stats import compute_dashboard_stats
+
+def test_sample_counts_extrapolated_to_population():
+    sample = pd.DataFrame({"cat": ["a", "a", "b", None], "x": [1.0, np.nan, 1.0, 2.0]})
+    stats = extrapolate_counts(compute_dashboard_stats(sample, backend=PandasBackend()), 400, len(sample))
+    assert stats["kpi"]["rows"] == 400
+    assert stats["numeric"].loc["x", "count"] == 300
+    table = stats["frequencies"]["cat"].set_index("Valeur")
+    assert table.loc["a", "Fréquence absolue"] == 200 and table.loc["a", "Fréquence relative (%)"] == 66.67
+    assert stats["quality"]["Valeurs manquantes"].tolist() == [100, 100]
+    assert stats["quality"]["Doublons totaux"].isna().all() and stats["quality_metrics"]["duplicates"] is None
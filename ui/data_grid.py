@@ -0,0 +1,116 @@
+# ui/data_grid.py
+# Grille de données paginée côté serveur : tri et filtre calculés en Python, seule la page
+# visible est envoyée au navigateur (mémoire du client constante quelle que soit la taille).
+# L'ordre de tri (argsort) est mis en cache par (version, colonne, sens), le filtre par
+# (version, spécification) : changer de page ne coûte qu'une sélection iloc.
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.settings import GRID_PAGE_SIZES, GRID_CACHE_ENTRIES, GRID_HEIGHT
+from core.cache import dataset_version, mask_key
+
+try:
+    from st_aggrid import AgGrid, GridOptionsBuilder
+    AGGRID_AVAILABLE = True
+except ImportError:
+    AGGRID_AVAILABLE = False
+
+NO_SORT = "Aucun"
+
+def sort_order(series, ascending=True):
+    """Positions triées (argsort stable) ; valeurs manquantes en dernier dans les deux sens"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        keys = pd.DatetimeIndex(series).asi8  # Dates naïves ou avec fuseau horaire
+        keys = np.where(series.isna().to_numpy(), np.iinfo(np.int64).max, keys if ascending else -keys)
+        return np.argsort(keys, kind="stable")
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        # argsort numpy : NaN placés en dernier
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        return np.argsort(values if ascending else -values, kind="stable")
+    # Texte / catégories : rangs des modalités triées
+    codes, uniques = pd.factorize(series, sort=True)
+    n = len(uniques)
+    keys = codes if ascending else n - 1 - codes
+    keys = np.where(codes < 0, n, keys)
+    return np.argsort(keys, kind="stable")
+
+def filter_positions(df, spec):
+    """Masque booléen d'un filtre de colonne : ("contains", texte) ou ("between", (min, max))"""
+    col, (op, value) = spec
+    series = df[col]
+    if op == "between":
+        low, high = value
+        return ((series >= low) & (series <= high)).to_numpy()
+    return series.astype(str).str.contains(value, case=False, regex=False, na=False).to_numpy() & series.notna().to_numpy()
+
+@st.cache_resource(show_spinner="Tri en cours...", max_entries=GRID_CACHE_ENTRIES)
+def _cached_order(_df, version, col, ascending):
+    return sort_order(_df[col], ascending)
+
+@st.cache_resource(show_spinner="Filtrage en cours...", max_entries=GRID_CACHE_ENTRIES)
+def _cached_filter(_df, version, spec):
+    return filter_positions(_df, spec)
+
+@st.cache_resource(show_spinner=False, max_entries=GRID_CACHE_ENTRIES)
+def _cached_rows(_df, version, sort, spec, key, _mask):
+    """Positions des lignes visibles dans l'ordre d'affichage (masque externe, filtre, tri)"""
+    keep = _mask
+    if spec is not None:
+        column_mask = _cached_filter(_df, version, spec)
+        keep = column_mask if keep is None else keep & column_mask
+    if sort is None:
+        return np.arange(len(_df)) if keep is None else np.flatnonzero(keep)
+    order = _cached_order(_df, version, *sort)
+    return order if keep is None else order[keep[order]]
+
+def _filter_controls(df, key):
+    """Widgets du filtre de colonne ; retourne la spécification (colonne, (op, valeur)) ou None"""
+    col = st.selectbox("Filtrer la colonne", [NO_SORT] + df.columns.tolist(), key=f"{key}_filter_col")
+    if col == NO_SORT:
+        return None
+    if pd.api.types.is_numeric_dtype(df[col]):
+        c1, c2 = st.columns(2)
+        low = c1.number_input("Min", value=None, key=f"{key}_filter_min")
+        high = c2.number_input("Max", value=None, key=f"{key}_filter_max")
+        if low is None and high is None:
+            return None
+        return col, ("between", (-np.inf if low is None else low, np.inf if high is None else high))
+    text = st.text_input("Contient", key=f"{key}_filter_text")
+    return (col, ("contains", text)) if text else None
+
+def _show_page(page_df, key):
+    if AGGRID_AVAILABLE:
+        # Tri / filtre désactivés dans la grille : ils ne porteraient que sur la page affichée
+        builder = GridOptionsBuilder.from_dataframe(page_df)
+        builder.configure_default_column(sortable=False, filter=False, resizable=True)
+        AgGrid(page_df, gridOptions=builder.build(), height=GRID_HEIGHT, key=f"{key}_aggrid",
+               theme="streamlit", show_search=False)
+    else:
+        st.dataframe(page_df, use_container_width=True, height=GRID_HEIGHT)
+
+def render_data_grid(df, key, mask=None):
+    """Affiche df (restreint au masque booléen `mask`) page par page avec tri et filtre serveur"""
+    version = dataset_version(df)
+
+    c1, c2, c3 = st.columns([2, 1, 1])
+    sort_col = c1.selectbox("Trier par", [NO_SORT] + df.columns.tolist(), key=f"{key}_sort_col")
+    ascending = c2.radio("Ordre", ["Croissant", "Décroissant"], horizontal=True, key=f"{key}_order") == "Croissant"
+    page_size = c3.selectbox("Lignes par page", GRID_PAGE_SIZES, key=f"{key}_page_size")
+    spec = _filter_controls(df, key)
+
+    sort = None if sort_col == NO_SORT else (sort_col, ascending)
+    rows = _cached_rows(df, version, sort, spec, mask_key(mask), mask)
+    n_pages = max(1, -(-len(rows) // page_size))
+
+    # Retour à la première page quand le tri, le filtre ou la taille de page change
+    signature = (version, sort, spec, mask_key(mask), page_size)
+    if st.session_state.get(f"{key}_signature") != signature:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[f"{key}_page"] = 1
+    page = st.number_input(f"Page (sur {n_pages:,})", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    page_df = df.iloc[rows[start:start + page_size]]
+    _show_page(page_df, key)
+    st.caption(f"Lignes {start + 1 if len(rows) else 0:,}–{start + len(page_df):,} sur {len(rows):,}")
@@ -1,16 +1,143 @@
 # ui/report_generator.py
-import streamlit as st
-from weasyprint import HTML
-import plotly.io as pio
+# Moteur de rapports PDF : gabarits Jinja2 compilés une fois par processus, tableaux bornés
+# (résumés, top N, échantillons), graphiques vectoriels SVG écrits à côté du document et
+# référencés par URL (pas de base64), budget de taille et de durée respecté section par section.
+# Le HTML est écrit en flux dans un fichier temporaire puis mis en page par WeasyPrint.
+import tempfile
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
-import base64
+import plotly.io as pio
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+from config.settings import (
+    REPORT_MAX_TABLE_ROWS, REPORT_MAX_TABLE_COLUMNS, REPORT_MAX_SECONDS, REPORT_MAX_HTML_BYTES,
+    REPORT_CHART_MAX_POINTS
+)
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+@lru_cache(maxsize=None)
+def _template(name):
+    """Gabarit compilé une seule fois par processus"""
+    env = Environment(loader=FileSystemLoader(TEMPLATES_DIR), autoescape=select_autoescape(["j2"]),
+                      trim_blocks=True, lstrip_blocks=True)
+    return env.get_template(name)
+
+def _format(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NaT:
+        return "", False
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return f"{value:,}".replace(",", " "), True
+    if isinstance(value, (float, np.floating)):
+        return f"{value:,.4g}".replace(",", " ") if abs(value) < 1e15 else f"{value:.3e}", True
+    return str(value), False
+
+def chart_sample(df, max_points=REPORT_CHART_MAX_POINTS):
+    """Échantillon pour les graphiques point par point (taille du SVG bornée)"""
+    return df.sample(max_points, random_state=0) if len(df) > max_points else df
+
+
+class ReportBuilder:
+    """Rapport construit section par section dans la limite d'un budget (durée, taille HTML).
+
+    Les sections au-delà du budget sont omises et signalées en fin de rapport.
+    À utiliser comme gestionnaire de contexte (répertoire temporaire des graphiques).
+    """
+
+    def __init__(self, title, max_seconds=REPORT_MAX_SECONDS, max_bytes=REPORT_MAX_HTML_BYTES):
+        self.title = title
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.sections = []
+        self.skipped = []
+        self.truncated = None
+        self.size = 0
+        self.start = time.perf_counter()
+        self._dir = tempfile.TemporaryDirectory(prefix="rapport_")
+        self._figures = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._dir.cleanup()
+
+    def _within_budget(self, title):
+        if self.truncated is None:
+            if time.perf_counter() - self.start > self.max_seconds:
+                self.truncated = f"durée > {self.max_seconds} s"
+            elif self.size > self.max_bytes:
+                self.truncated = f"taille > {self.max_bytes // 1024} Ko"
+        if self.truncated is not None:
+            self.skipped.append(title or "Texte")
+            return False
+        return True
+
+    def _add(self, **context):
+        html = _template("section.html.j2").render(**context)
+        self.size += len(html.encode())
+        self.sections.append(Markup(html))
+
+    def add_text(self, title, *lines):
+        if self._within_budget(title):
+            self._add(kind="text", title=title, lines=lines)
+
+    def add_table(self, title, df, max_rows=REPORT_MAX_TABLE_ROWS, max_columns=REPORT_MAX_TABLE_COLUMNS, index=True):
+        """Tableau borné : seules les max_rows premières lignes / max_columns colonnes sont rendues"""
+        if not self._within_budget(title):
+            return
+        shown = df.iloc[:max_rows, :max_columns]
+        rows = [(_format(label)[0], [_format(value) for value in values])
+                for label, values in zip(shown.index, shown.itertuples(index=False, name=None))]
+        self._add(kind="table", title=title, columns=[str(col) for col in shown.columns], rows=rows,
+                  index_name=(df.index.name or "") if index else None,
+                  shown_rows=len(shown), hidden_rows=len(df) - len(shown),
+                  hidden_cols=len(df.columns) - len(shown.columns))
+
+    def add_figure(self, title, fig, width=900, height=550):
+        """Graphique Plotly exporté en SVG (vectoriel) et référencé par le document"""
+        if not self._within_budget(title):
+            return
+        self._figures += 1
+        name = f"figure_{self._figures}.svg"
+        try:
+            Path(self._dir.name, name).write_bytes(pio.to_image(fig, format="svg", width=width, height=height))
+        except Exception as e:  # Kaleido / navigateur absent : le rapport est produit sans ce graphique
+            message = next((line.strip() for line in str(e).splitlines() if line.strip()), type(e).__name__)
+            self._add(kind="figure", title=title, src=None, error=message)
+            return
+        self._add(kind="figure", title=title, src=name)
+
+    def write_html(self, path):
+        """Écrit le document en flux (pas de chaîne HTML complète en mémoire)"""
+        _template("report.html.j2").stream(
+            title=self.title, generated_at=datetime.now().strftime('%d/%m/%Y à %H:%M'),
+            sections=self.sections, truncated=self.truncated, skipped=self.skipped
+        ).dump(str(path), encoding="utf-8")
+
+    def write_pdf(self, output_path=None):
+        """Met en page le rapport ; retourne les octets du PDF, ou le chemin si output_path est fourni"""
+        from weasyprint import HTML  # Import local : dépend des librairies système (Pango)
+        html_path = Path(self._dir.name, "rapport.html")
+        self.write_html(html_path)
+        document = HTML(filename=str(html_path), base_url=self._dir.name)
+        if output_path is None:
+            return document.write_pdf()
+        document.write_pdf(output_path)
+        return output_path
+
 
 def generate_pdf(df: pd.DataFrame, figures: list, title: str):
-    html = f"<h1>{title}</h1><table>{df.to_html()}</table>"
-    for fig in figures:
-        img = pio.to_image(fig, format='png')
-        b64 = base64.b64encode(img).decode()
-        html += f'<img src="data:image/png;base64,{b64}" />'
-    
-    pdf = HTML(string=html).write_pdf()
-    return pdf
\ No newline at end of file
+    with ReportBuilder(title) as report:
+        report.add_text("Données", f"{len(df):,} lignes × {len(df.columns)} colonnes".replace(",", " "))
+        report.add_table("Statistiques", df.describe(include='all').T)
+        report.add_table("Échantillon", df.head(REPORT_MAX_TABLE_ROWS), index=False)
+        for i, fig in enumerate(figures, start=1):
+            report.add_figure(fig.layout.title.text or f"Graphique {i}", fig)
+        return report.write_pdf()